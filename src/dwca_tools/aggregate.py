@@ -2,25 +2,48 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, cast
 
 import typer
 from rich.console import Console
-from rich.progress import BarColumn, Progress, TextColumn, TimeElapsedColumn
-from sqlalchemy import Column, Integer, MetaData, String, Table, func, select
+from sqlalchemy import Column, Integer, MetaData, String, Table, func, select, text
 
+from .convert import create_indexes
 from .db import create_engine_and_session, summarize_sql_tables
+from .settings import get_convert_settings
 
 if TYPE_CHECKING:
-    from sqlalchemy.engine import Engine
+    from sqlalchemy.engine import CursorResult, Engine
     from sqlalchemy.orm import Session
 
 app = typer.Typer(no_args_is_help=True)
 console = Console()
 
 
-def create_taxa_table(engine: Engine, session: Session, batch_size: int) -> None:
-    """Create and populate a taxa aggregation table."""
+def prepare_aggregate_indexes(engine: Engine) -> None:
+    """Index the columns the taxa aggregate groups and joins on, then ANALYZE.
+
+    Without these the join falls back to full scans or per-run hash builds.
+    """
+    maintenance_work_mem = get_convert_settings().maintenance_work_mem
+    create_indexes(
+        engine, "occurrence", ["taxonID", "gbifID"], maintenance_work_mem=maintenance_work_mem
+    )
+    create_indexes(engine, "multimedia", ["gbifID"], maintenance_work_mem=maintenance_work_mem)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def create_taxa_table(engine: Engine, session: Session) -> None:
+    """Create and populate a taxa aggregation table.
+
+    The aggregation runs as a single ``INSERT ... SELECT`` so no rows pass
+    through Python. Occurrence and multimedia counts are computed in separate
+    subqueries (multimedia is linked to taxa through ``gbifID``) so one does
+    not inflate the other. Existing taxa rows are deleted in the same
+    transaction, so re-running the command refreshes the counts on every
+    dialect.
+    """
     metadata = MetaData()
     taxa = Table(
         "taxa",
@@ -38,64 +61,82 @@ def create_taxa_table(engine: Engine, session: Session, batch_size: int) -> None
     occurrence = Table("occurrence", metadata, autoload_with=engine, extend_existing=True)
     multimedia = Table("multimedia", metadata, autoload_with=engine, extend_existing=True)
 
-    query = (
+    occurrence_counts = (
         select(
             occurrence.c.taxonID,
-            occurrence.c.scientificName,
-            occurrence.c.family,
-            func.count(occurrence.c.taxonID).label("occurrences_count"),
-            func.count(multimedia.c.taxonID).label("multimedia_count"),
+            func.min(occurrence.c.scientificName).label("scientificName"),
+            func.min(occurrence.c.family).label("family"),
+            func.count().label("occurrences_count"),
+        )
+        .where(occurrence.c.taxonID.is_not(None))
+        .group_by(occurrence.c.taxonID)
+        .subquery()
+    )
+    multimedia_counts = (
+        select(occurrence.c.taxonID, func.count().label("multimedia_count"))
+        .select_from(multimedia.join(occurrence, multimedia.c.gbifID == occurrence.c.gbifID))
+        .group_by(occurrence.c.taxonID)
+        .subquery()
+    )
+    query = select(
+        occurrence_counts.c.taxonID,
+        occurrence_counts.c.scientificName,
+        occurrence_counts.c.family,
+        occurrence_counts.c.occurrences_count,
+        func.coalesce(multimedia_counts.c.multimedia_count, 0),
+    ).select_from(
+        occurrence_counts.outerjoin(
+            multimedia_counts, occurrence_counts.c.taxonID == multimedia_counts.c.taxonID
         )
-        .select_from(occurrence.outerjoin(multimedia, occurrence.c.taxonID == multimedia.c.taxonID))
-        .group_by(occurrence.c.taxonID, occurrence.c.scientificName, occurrence.c.family)
     )
 
-    result = session.execute(query).fetchall()
-    unique_taxon_ids = {row.taxonID: row for row in result if row.taxonID is not None}
-
-    with Progress(
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TextColumn("[progress.completed]{task.completed} rows"),
-        TimeElapsedColumn(),
-    ) as progress:
-        task = progress.add_task(
-            "[cyan]Inserting data into taxa table...", total=len(unique_taxon_ids)
+    with console.status("[cyan]Inserting data into taxa table...[/cyan]"):
+        session.execute(taxa.delete())
+        result = cast(
+            "CursorResult[Any]",
+            session.execute(
+                taxa.insert().from_select(
+                    [
+                        "taxonID",
+                        "scientificName",
+                        "family",
+                        "occurrences_count",
+                        "multimedia_count",
+                    ],
+                    query,
+                )
+            ),
         )
-        rows = []
-        for _count, taxon_id in enumerate(unique_taxon_ids.keys(), 1):
-            taxon_info = unique_taxon_ids[taxon_id]
-            rows.append(
-                {
-                    "taxonID": taxon_id,
-                    "scientificName": taxon_info.scientificName,
-                    "family": taxon_info.family,
-                    "occurrences_count": taxon_info.occurrences_count,
-                    "multimedia_count": taxon_info.multimedia_count,
-                }
-            )
-            if len(rows) >= batch_size:
-                session.execute(taxa.insert(), rows)
-                session.commit()
-                progress.update(task, advance=len(rows))
-                rows = []
-        if rows:
-            session.execute(taxa.insert(), rows)
-            session.commit()
-            progress.update(task, advance=len(rows))
-        progress.remove_task(task)
-        console.print(f"[green]Inserted {len(unique_taxon_ids)} rows into taxa table.[/green]")
+        session.commit()
+    console.print(f"[green]Inserted {result.rowcount} rows into taxa table.[/green]")
+    # Lets the "highest" queries read the top of an index instead of sorting.
+    create_indexes(engine, "taxa", ["occurrences_count", "multimedia_count"])
 
 
 @app.command()
-def populate_taxa_table(db_url: str, batch_size: int = 1000) -> None:
+def populate_taxa_table(
+    db_url: str,
+    batch_size: int | None = typer.Option(
+        None,
+        hidden=True,
+        help="Deprecated and ignored: the table is filled by a single INSERT ... SELECT.",
+    ),
+) -> None:
     """Populate taxa aggregation table in an existing database."""
+    if batch_size is not None:
+        console.print(
+            "[yellow]--batch-size is deprecated and ignored; "
+            "the taxa table is now filled in one statement.[/yellow]"
+        )
     console.print(f"[cyan]Populating taxa table in database:[/cyan] {db_url}")
 
     engine, session = create_engine_and_session(db_url)
 
+    console.print("[cyan]Indexing join columns...[/cyan]")
+    prepare_aggregate_indexes(engine)
+
     console.print("[cyan]Creating taxa table...[/cyan]")
-    create_taxa_table(engine, session, batch_size)
+    create_taxa_table(engine, session)
 
     console.print("[cyan]Summarizing SQL tables...[/cyan]")
     summarize_sql_tables(engine, session)
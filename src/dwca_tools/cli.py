@@ -6,18 +6,78 @@ This module provides the main entry point for the CLI.
 
 from __future__ import annotations
 
+import importlib
+from functools import cache
+from typing import TYPE_CHECKING
+
 import typer
 from rich.console import Console
+from typer.core import TyperCommand, TyperGroup
 
 from . import __version__
-from .aggregate import app as aggregate_app
-from .convert import app as convert_app
-from .download import app as download_app
-from .summarize import app as summarize_app
+
+if TYPE_CHECKING:
+    # Annotations only: newer typer releases vendor click instead of depending
+    # on it, so nothing here may import click at runtime.
+    from click import Command, Context
 
 console = Console()
 
+# Subcommand name -> (module defining a Typer ``app``, help text). Modules are
+# imported only when their subcommand is dispatched, so ``--version``, ``--help``
+# and unrelated subcommands do not pay for sqlalchemy, pydantic-settings, etc.
+SUBCOMMANDS: dict[str, tuple[str, str]] = {
+    "summarize": ("dwca_tools.summarize", "Inspect and summarize DwC-A files"),
+    "convert": ("dwca_tools.convert", "Convert DwC-A files to SQL databases"),
+    "aggregate": ("dwca_tools.aggregate", "Create aggregation tables"),
+    "download": ("dwca_tools.download", "Request and fetch GBIF occurrence downloads"),
+}
+
+
+@cache
+def load_subcommand(cmd_name: str) -> Command:
+    """Import the module behind *cmd_name* and build its command group once."""
+    module_name, help_text = SUBCOMMANDS[cmd_name]
+    sub_app = importlib.import_module(module_name).app
+    command = typer.main.get_group(sub_app)
+    command.name = cmd_name
+    command.help = help_text
+    return command
+
+
+@cache
+def subcommand_placeholder(cmd_name: str) -> Command:
+    """Return a stand-in for *cmd_name* that carries only its name and help text."""
+    return TyperCommand(cmd_name, help=SUBCOMMANDS[cmd_name][1])
+
+
+class LazyGroup(TyperGroup):
+    """Typer group that loads subcommand apps on first use.
+
+    Help output and shell completion only list subcommands, so ``get_command``
+    hands them a placeholder; the module is imported once a subcommand is
+    actually resolved for dispatch.
+    """
+
+    def list_commands(self, ctx: Context) -> list[str]:
+        return [*super().list_commands(ctx), *SUBCOMMANDS]
+
+    def get_command(self, ctx: Context, cmd_name: str) -> Command | None:
+        if cmd_name not in SUBCOMMANDS:
+            return super().get_command(ctx, cmd_name)
+        return subcommand_placeholder(cmd_name)
+
+    def resolve_command(
+        self, ctx: Context, args: list[str]
+    ) -> tuple[str | None, Command | None, list[str]]:
+        cmd_name, command, remaining = super().resolve_command(ctx, args)
+        if cmd_name in SUBCOMMANDS:
+            command = load_subcommand(cmd_name)
+        return cmd_name, command, remaining
+
+
 app = typer.Typer(
+    cls=LazyGroup,
     no_args_is_help=True,
     help="Tools for working with Darwin Core Archive (DwC-A) files",
 )
@@ -45,12 +105,5 @@ def main(
     pass
 
 
-# Add subcommands
-app.add_typer(summarize_app, name="summarize", help="Inspect and summarize DwC-A files")
-app.add_typer(convert_app, name="convert", help="Convert DwC-A files to SQL databases")
-app.add_typer(aggregate_app, name="aggregate", help="Create aggregation tables")
-app.add_typer(download_app, name="download", help="Request and fetch GBIF occurrence downloads")
-
-
 if __name__ == "__main__":
     app()
@@ -5,16 +5,19 @@ from __future__ import annotations
 import csv
 import sys
 import zipfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from io import StringIO, TextIOWrapper
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from functools import partial
+from io import BufferedReader, BytesIO, StringIO, TextIOWrapper
+from itertools import chain, islice
+from operator import itemgetter
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import typer
 from rich.console import Console
-from rich.progress import BarColumn, Progress, TextColumn, TimeElapsedColumn
+from rich.progress import BarColumn, DownloadColumn, Progress, TextColumn, TimeElapsedColumn
 from rich.table import Table as RichTable
-from sqlalchemy import MetaData, Table, text
+from sqlalchemy import text
 
 from . import queries
 from .db import (
@@ -29,12 +32,13 @@ from .summarize import summarize_tables
 from .utils import human_readable_number
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Callable, Generator, Iterable
     from concurrent.futures import Future
+    from typing import IO
     from zipfile import ZipFile
 
     from rich.progress import TaskID
-    from sqlalchemy.engine import Engine
+    from sqlalchemy.engine import Connection, Engine
     from sqlalchemy.orm import Session
 
     from .schemas import TableDefinition
@@ -42,29 +46,81 @@ if TYPE_CHECKING:
 app = typer.Typer(no_args_is_help=True)
 console = Console()
 
+# Quoted archives go through csv.reader, whose default 128 KiB field cap is
+# too small for long remarks/dynamicProperties values.
 csv.field_size_limit(sys.maxsize)
 
 
 # -- Chunked reading --
 
 
+READ_BUFFER_SIZE = 1 << 20
+
+
+def _split_line(line: str) -> list[str]:
+    return line.rstrip("\r\n").split("\t")
+
+
 def read_chunks(
-    zip_ref: ZipFile, filename: str, chunk_size: int
+    zip_ref: ZipFile,
+    filename: str,
+    chunk_size: int,
+    on_read: Callable[[int], None] | None = None,
+    quotechar: str = "",
 ) -> Generator[tuple[list[str], list[list[str]]], None, None]:
-    """Yield (headers, chunk) tuples from a tab-delimited file inside a zip."""
+    """Yield (headers, chunk) tuples from a tab-delimited file inside a zip.
+
+    Lines are split on tabs unless *quotechar* (meta.xml's ``fieldsEnclosedBy``)
+    is set, in which case ``csv.reader`` handles the quoting. If given,
+    *on_read* is called before each chunk is yielded with the number of
+    uncompressed bytes consumed since the previous call.
+    """
     with zip_ref.open(filename, "r") as f, TextIOWrapper(f, encoding="utf-8") as text_file:
-        reader = csv.reader(text_file, delimiter="\t")
-        headers = next(reader)
-        chunk: list[list[str]] = []
-        for row in reader:
-            chunk.append(row)
-            if len(chunk) >= chunk_size:
-                yield headers, chunk
-                chunk = []
-        if chunk:
+        if quotechar:
+            reader = csv.reader(text_file, delimiter="\t", quotechar=quotechar)
+            headers = next(reader)
+            # islice pulls each chunk from the C reader without a per-row Python loop
+            chunks = iter(lambda: list(islice(reader, chunk_size)), [])
+        else:
+            headers = _split_line(next(text_file))
+            chunks = iter(lambda: [_split_line(line) for line in islice(text_file, chunk_size)], [])
+        position = 0
+        for chunk in chunks:
+            if on_read is not None:
+                new_position = f.tell()
+                on_read(new_position - position)
+                position = new_position
             yield headers, chunk
 
 
+def read_line_chunks(
+    zip_ref: ZipFile,
+    filename: str,
+    chunk_size: int,
+    on_read: Callable[[int], None] | None = None,
+) -> Generator[list[bytes], None, None]:
+    """Yield chunks of raw, undecoded lines from a file inside a zip, header skipped.
+
+    If given, *on_read* is called before each chunk is yielded with the number
+    of uncompressed bytes it covers (the header is counted with the first chunk).
+    """
+    with zip_ref.open(filename, "r") as f, BufferedReader(f, READ_BUFFER_SIZE) as reader:  # type: ignore[arg-type]
+        pending = len(reader.readline())
+        while chunk := list(islice(reader, chunk_size)):
+            if on_read is not None:
+                on_read(pending + sum(map(len, chunk)))
+                pending = 0
+            yield chunk
+
+
+def read_headers(zip_ref: ZipFile, filename: str, quotechar: str = "") -> list[str]:
+    """Return the header row of a tab-delimited file inside a zip."""
+    with zip_ref.open(filename, "r") as f, TextIOWrapper(f, encoding="utf-8") as text_file:
+        if quotechar:
+            return next(csv.reader(text_file, delimiter="\t", quotechar=quotechar))
+        return _split_line(next(text_file))
+
+
 def filter_columns(headers: list[str], columns_of_interest: list[str] | None) -> list[str]:
     """Return intersection of headers with desired columns, preserving header order."""
     if columns_of_interest is not None:
@@ -75,97 +131,145 @@ def filter_columns(headers: list[str], columns_of_interest: list[str] | None) ->
 # -- Row estimation --
 
 
-def _count_newlines(file_obj: object, task: TaskID, progress: Progress) -> int:
-    """Count newlines in a binary file object using buffered reads."""
-
-    def _make_gen(reader: object) -> Generator[bytes, None, None]:
-        while True:
-            b = reader(2**16)  # type: ignore[operator]
-            if not b:
-                break
-            yield b
+ROW_SAMPLE_SIZE = 256 * 1024
 
-    total = 0
-    for buf in _make_gen(file_obj.read):  # type: ignore[union-attr]
-        n = buf.count(b"\n")
-        total += n
-        progress.update(task, advance=n)
-    return total
 
+def estimate_row_count(zip_ref: ZipFile, filename: str) -> int:
+    """Estimate rows from the member's size and the line density of its first bytes.
 
-def estimate_row_count(zip_ref: ZipFile, filename: str, progress: Progress, task: TaskID) -> int:
-    """Estimate rows by counting newlines in the file."""
+    Only the first ``ROW_SAMPLE_SIZE`` bytes are decompressed; members smaller
+    than that are counted exactly.
+    """
+    file_size = zip_ref.getinfo(filename).file_size
     with zip_ref.open(filename, "r") as f:
-        return _count_newlines(f, task, progress)
+        sample = f.read(ROW_SAMPLE_SIZE)
+    newlines = sample.count(b"\n")
+    if not sample or len(sample) >= file_size:
+        return newlines
+    return file_size * newlines // len(sample)
 
 
-def estimate_and_display_row_counts(
-    zip_ref: ZipFile,
-    tables: list[TableDefinition],
-    num_threads: int,
-) -> dict[str, int]:
-    """Count rows for each table in parallel and display results."""
-    table_row_counts: dict[str, int] = {}
-    with (
-        Progress(
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TextColumn("[progress.completed]{task.completed} rows"),
-            TimeElapsedColumn(),
-        ) as progress,
-        ThreadPoolExecutor(max_workers=num_threads) as executor,
-    ):
-        future_to_table: dict[Future[int], tuple[str, TaskID]] = {}
-        for table_def in tables:
-            task = progress.add_task(f"[cyan]Counting rows in {table_def.name}...", total=None)
-            future = executor.submit(
-                estimate_row_count, zip_ref, table_def.filename, progress, task
-            )
-            future_to_table[future] = (table_def.name, task)
-
-        for future in as_completed(future_to_table):
-            table_name, task = future_to_table[future]
-            row_count = future.result()
-            table_row_counts[table_name] = row_count
-            console.print(
-                f"[green]Estimated rows for {table_name}:"
-                f" {human_readable_number(row_count)}[/green]"
-            )
-            progress.remove_task(task)
-    return table_row_counts
+# -- Insert progress --
+
+
+def _insert_progress() -> Progress:
+    """Progress bar for inserting a member, measured in uncompressed bytes."""
+    return Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TimeElapsedColumn(),
+    )
 
 
 # -- PostgreSQL fast path: COPY --
 
 
-def _pg_copy_chunk(
-    engine: Engine,
-    table_name: str,
-    headers: list[str],
-    chunk: list[list[str]],
-    filtered_columns: list[str],
-) -> None:
-    """Copy a chunk into PostgreSQL using COPY FROM STDIN."""
-    col_indices = [headers.index(col) for col in filtered_columns]
+def _row_getter[T](indices: list[int]) -> Callable[[list[T]], tuple[T, ...]]:
+    """Return a C-level callable that picks *indices* from a row as a tuple."""
+    if len(indices) == 1:
+        (idx,) = indices
+        return lambda row: (row[idx],)
+    return itemgetter(*indices)
+
+
+def _pg_copy_sql(table_name: str, columns: list[str], quotechar: str) -> str:
+    """COPY statement for tab-delimited CSV quoted with *quotechar*.
+
+    An empty *quotechar* means fields are never quoted; COPY still needs a
+    quote character, so one that does not occur in text (``\\x01``) is used.
+    """
+    col_list = ", ".join(f'"{col}"' for col in columns)
+    quote = "E'\\x01'" if not quotechar else "'" + quotechar.replace("'", "''") + "'"
+    return (
+        f"COPY {table_name} ({col_list}) FROM STDIN"
+        f" WITH (FORMAT CSV, DELIMITER E'\\t', QUOTE {quote}, HEADER FALSE)"
+    )
+
+
+def _encode_lines(getter: Callable[[list[bytes]], tuple[bytes, ...]], lines: list[bytes]) -> bytes:
+    """Pick fields from raw unquoted lines and join them back as COPY input."""
+    return b"".join(
+        [b"\t".join(getter(line.rstrip(b"\r\n").split(b"\t"))) + b"\n" for line in lines]
+    )
+
+
+def _encode_rows(getter: Callable[[list[str]], tuple[str, ...]], rows: list[list[str]]) -> bytes:
+    """Pick fields from parsed rows and write them as ``"``-quoted COPY input."""
     buffer = StringIO()
-    writer = csv.writer(buffer, delimiter="\t", quoting=csv.QUOTE_MINIMAL)
-    writer.writerow(filtered_columns)
-    for row in chunk:
-        writer.writerow(row[i] for i in col_indices)
-    buffer.seek(0)
+    csv.writer(buffer, delimiter="\t", lineterminator="\n").writerows(map(getter, rows))
+    return buffer.getvalue().encode("utf-8")
 
+
+def _pg_copy_chunk(
+    engine: Engine,
+    copy_sql: str,
+    encode: Callable[[list[Any]], bytes],
+    chunk: list[Any],
+) -> int:
+    """Encode a chunk and copy it into PostgreSQL using COPY FROM STDIN."""
+    buffer = BytesIO(encode(chunk))
     conn = engine.raw_connection()
     try:
         cursor = conn.cursor()
-        col_list = ", ".join(f'"{col}"' for col in filtered_columns)
-        cursor.copy_expert(  # type: ignore[attr-defined]
-            f"COPY {table_name} ({col_list}) FROM STDIN"
-            " WITH (FORMAT CSV, DELIMITER '\t', HEADER TRUE)",
-            buffer,
-        )
+        cursor.copy_expert(copy_sql, buffer)  # type: ignore[attr-defined]
         conn.commit()
     finally:
         conn.close()
+    return len(chunk)
+
+
+class _ProgressReader:
+    """File wrapper that advances a progress task by the bytes read through it."""
+
+    def __init__(self, raw: IO[bytes], progress: Progress, task: TaskID) -> None:
+        self._raw = raw
+        self._progress = progress
+        self._task = task
+
+    def read(self, size: int = -1) -> bytes:
+        buf = self._raw.read(size)
+        self._progress.advance(self._task, len(buf))
+        return buf
+
+
+def _pg_copy_member(
+    engine: Engine,
+    zip_ref: ZipFile,
+    table_name: str,
+    filename: str,
+    quotechar: str,
+    progress: Progress,
+    task: TaskID,
+) -> int:
+    """COPY a whole archive member into PostgreSQL without parsing it in Python.
+
+    Used when every column is loaded: the member is already tab-delimited,
+    so its bytes are handed to COPY as they come out of the decompressor.
+    Returns the number of rows copied.
+    """
+    with zip_ref.open(filename, "r") as f:
+        header_line = f.readline()
+        progress.advance(task, len(header_line))
+        header_text = header_line.decode("utf-8")
+        headers = (
+            next(csv.reader([header_text], delimiter="\t", quotechar=quotechar))
+            if quotechar
+            else _split_line(header_text)
+        )
+        conn = engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.copy_expert(  # type: ignore[attr-defined]
+                _pg_copy_sql(table_name, headers, quotechar),
+                _ProgressReader(f, progress, task),
+                size=READ_BUFFER_SIZE,
+            )
+            row_count = cursor.rowcount
+            conn.commit()
+        finally:
+            conn.close()
+    return row_count
 
 
 def _pg_insert_table(
@@ -174,82 +278,176 @@ def _pg_insert_table(
     table_name: str,
     filename: str,
     columns: list[str] | None,
+    quotechar: str,
     chunk_size: int,
     num_threads: int,
-    total_rows: int,
-) -> None:
-    """Insert data into PostgreSQL using threaded COPY."""
-    with Progress(
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TextColumn("[progress.completed]{task.completed} rows"),
-        TimeElapsedColumn(),
-    ) as progress:
-        task = progress.add_task(f"[cyan]Inserting data into {table_name}...", total=total_rows)
-        with ThreadPoolExecutor(max_workers=num_threads) as executor:
-            futures: dict[Future[None], int] = {}
-            for headers, chunk in read_chunks(zip_ref, filename, chunk_size):
-                filtered_columns = filter_columns(headers, columns)
-                chunk_len = len(chunk)
-                future = executor.submit(
-                    _pg_copy_chunk, engine, table_name, headers, chunk, filtered_columns
+) -> int:
+    """Insert data into PostgreSQL using threaded COPY and return the row count."""
+    with _insert_progress() as progress:
+        task = progress.add_task(
+            f"[cyan]Inserting data into {table_name}...",
+            total=zip_ref.getinfo(filename).file_size,
+        )
+        if columns is None:
+            return _pg_copy_member(engine, zip_ref, table_name, filename, quotechar, progress, task)
+        # Reading lines (this thread) overlaps with splitting and COPY (workers);
+        # capping the jobs in flight keeps memory at O(num_threads * chunk_size) rows.
+        max_pending = 2 * num_threads
+        headers = read_headers(zip_ref, filename, quotechar)
+        filtered_columns = filter_columns(headers, columns)
+        for col in filtered_columns:
+            validate_sql_identifier(col)
+        getter = _row_getter([headers.index(col) for col in filtered_columns])
+
+        def on_read(n: int) -> None:
+            progress.advance(task, n)
+
+        chunks: Iterable[list[Any]]
+        if quotechar:
+            # Quoted fields may contain tabs or newlines: parse, then re-quote
+            chunks = (
+                chunk
+                for _headers, chunk in read_chunks(
+                    zip_ref, filename, chunk_size, on_read, quotechar
                 )
-                futures[future] = chunk_len
-            for future in as_completed(futures):
-                future.result()
-                progress.update(task, advance=futures[future])
+            )
+            encode = partial(_encode_rows, getter)
+            copy_sql = _pg_copy_sql(table_name, filtered_columns, '"')
+        else:
+            chunks = read_line_chunks(zip_ref, filename, chunk_size, on_read)
+            encode = partial(_encode_lines, getter)
+            copy_sql = _pg_copy_sql(table_name, filtered_columns, "")
+
+        row_count = 0
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            pending: set[Future[int]] = set()
+            for chunk in chunks:
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    row_count += sum(future.result() for future in done)
+                pending.add(executor.submit(_pg_copy_chunk, engine, copy_sql, encode, chunk))
+            row_count += sum(future.result() for future in as_completed(pending))
+        return row_count
 
 
-# -- SQLite path: batched SQLAlchemy insert --
+# -- SQLite path: DBAPI executemany --
 
 
 def _sqlite_insert_table(
     engine: Engine,
-    session: Session,
     zip_ref: ZipFile,
     table_name: str,
     filename: str,
+    *,
     columns: list[str] | None,
+    quotechar: str,
     chunk_size: int,
-    total_rows: int,
-) -> None:
-    """Insert data into SQLite using batched SQLAlchemy inserts."""
-    table = Table(table_name, MetaData(), autoload_with=engine, extend_existing=True)
-    with Progress(
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TextColumn("[progress.completed]{task.completed} rows"),
-        TimeElapsedColumn(),
-    ) as progress:
-        task = progress.add_task(f"[cyan]Inserting data into {table_name}...", total=total_rows)
-        for headers, chunk in read_chunks(zip_ref, filename, chunk_size):
-            filtered_columns = filter_columns(headers, columns)
-            col_indices = [headers.index(col) for col in filtered_columns]
-            rows = [
-                {col: row[idx] for col, idx in zip(filtered_columns, col_indices, strict=True)}
-                for row in chunk
-            ]
-            session.execute(table.insert(), rows)
-            session.commit()
-            progress.update(task, advance=len(chunk))
+) -> int:
+    """Insert data into SQLite with ``executemany`` on the raw DBAPI connection.
+
+    Rows go in as positional tuples, skipping SQLAlchemy's per-row parameter
+    processing, and the whole file is loaded in one transaction. Returns the
+    number of rows inserted.
+    """
+    validate_sql_identifier(table_name)
+    with _insert_progress() as progress:
+        task = progress.add_task(
+            f"[cyan]Inserting data into {table_name}...",
+            total=zip_ref.getinfo(filename).file_size,
+        )
+        headers = read_headers(zip_ref, filename, quotechar)
+        filtered_columns = filter_columns(headers, columns)
+        for col in filtered_columns:
+            validate_sql_identifier(col)
+        getter = _row_getter([headers.index(col) for col in filtered_columns])
+        col_list = ", ".join(f'"{col}"' for col in filtered_columns)
+        placeholders = ", ".join("?" * len(filtered_columns))
+        insert_sql = f"INSERT INTO {table_name} ({col_list}) VALUES ({placeholders})"
+
+        row_count = 0
+        conn = engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            for _headers, chunk in read_chunks(
+                zip_ref,
+                filename,
+                chunk_size,
+                on_read=lambda n: progress.advance(task, n),
+                quotechar=quotechar,
+            ):
+                cursor.executemany(insert_sql, list(map(getter, chunk)))
+                row_count += len(chunk)
+            conn.commit()
+        finally:
+            conn.close()
+    return row_count
 
 
 # -- Index creation --
 
 
-def create_indexes(engine: Engine, table_name: str, indexes: list[str]) -> None:
-    """Create indexes on specified columns, skipping columns not in schema."""
+def _set_maintenance_work_mem(conn: Connection, maintenance_work_mem: str | None) -> None:
+    """Raise ``maintenance_work_mem`` for the rest of *conn*'s PostgreSQL transaction."""
+    if maintenance_work_mem is not None:
+        conn.execute(
+            text("SELECT set_config('maintenance_work_mem', :value, true)"),
+            {"value": maintenance_work_mem},
+        )
+
+
+def _pg_create_index(engine: Engine, statement: str, maintenance_work_mem: str | None) -> None:
+    """Run one CREATE INDEX on its own PostgreSQL connection."""
+    with engine.begin() as conn:
+        _set_maintenance_work_mem(conn, maintenance_work_mem)
+        conn.exec_driver_sql(statement)
+
+
+def create_indexes(
+    engine: Engine,
+    table_name: str,
+    indexes: list[str],
+    *,
+    num_threads: int = 1,
+    maintenance_work_mem: str | None = None,
+    existing_columns: set[str] | None = None,
+) -> None:
+    """Create indexes on specified columns, skipping columns not in schema.
+
+    On PostgreSQL the indexes are built in parallel on up to *num_threads*
+    connections, each with *maintenance_work_mem* if given, so peak memory is
+    up to *num_threads* times that value; a single index, or ``num_threads=1``,
+    is built in one transaction with the same setting. Elsewhere they are
+    created in order in a single transaction. Pass *existing_columns* to skip
+    reflecting the table's columns again.
+    """
     validate_sql_identifier(table_name)
-    existing_columns_lower = {c.lower() for c in get_table_column_names(engine, table_name)}
-    with engine.connect() as conn:
-        for col in indexes:
-            if col.lower() not in existing_columns_lower:
-                continue
-            validate_sql_identifier(col)
-            conn.execute(
-                text(f'CREATE INDEX IF NOT EXISTS idx_{table_name}_{col} ON {table_name} ("{col}")')
-            )
-            conn.commit()
+    if existing_columns is None:
+        existing_columns = get_table_column_names(engine, table_name)
+    existing_columns_lower = {c.lower() for c in existing_columns}
+    statements = []
+    for col in indexes:
+        if col.lower() not in existing_columns_lower:
+            continue
+        validate_sql_identifier(col)
+        statements.append(
+            f'CREATE INDEX IF NOT EXISTS idx_{table_name}_{col} ON {table_name} ("{col}")'
+        )
+
+    if _is_postgres(engine) and num_threads > 1 and len(statements) > 1:
+        with ThreadPoolExecutor(max_workers=min(num_threads, len(statements))) as executor:
+            futures = [
+                executor.submit(_pg_create_index, engine, statement, maintenance_work_mem)
+                for statement in statements
+            ]
+            for future in as_completed(futures):
+                future.result()
+        return
+
+    with engine.begin() as conn:
+        if _is_postgres(engine):
+            _set_maintenance_work_mem(conn, maintenance_work_mem)
+        for statement in statements:
+            conn.exec_driver_sql(statement)
 
 
 # -- Data insertion dispatcher --
@@ -262,10 +460,8 @@ def _is_postgres(engine: Engine) -> bool:
 
 def insert_data(
     engine: Engine,
-    session: Session,
     zip_ref: ZipFile,
     tables: list[TableDefinition],
-    table_row_counts: dict[str, int],
     chunk_size: int,
     num_threads: int,
 ) -> None:
@@ -279,15 +475,16 @@ def insert_data(
             conn.commit()
 
     for table_def in tables:
-        row_count = table_row_counts[table_def.name]
+        estimated_rows = estimate_row_count(zip_ref, table_def.filename)
         console.print(
             f"[cyan]Processing table: {table_def.name}"
-            f" with {human_readable_number(row_count)} rows[/cyan]"
+            f" with ~{human_readable_number(estimated_rows)} rows[/cyan]"
         )
 
         # Intersect desired columns with actual schema columns (case-insensitive
         # because PostgreSQL folds unquoted identifiers to lowercase)
-        schema_columns_lower = {c.lower() for c in get_table_column_names(engine, table_def.name)}
+        schema_columns = get_table_column_names(engine, table_def.name)
+        schema_columns_lower = {c.lower() for c in schema_columns}
         columns_of_interest = settings.columns_of_interest.get(table_def.name)
         if columns_of_interest is not None:
             columns_of_interest = [
@@ -295,31 +492,44 @@ def insert_data(
             ]
 
         if use_pg:
-            _pg_insert_table(
+            row_count = _pg_insert_table(
                 engine,
                 zip_ref,
                 table_def.name,
                 table_def.filename,
                 columns_of_interest,
+                table_def.fields_enclosed_by,
                 chunk_size,
                 num_threads,
-                row_count,
             )
         else:
-            _sqlite_insert_table(
+            row_count = _sqlite_insert_table(
                 engine,
-                session,
                 zip_ref,
                 table_def.name,
                 table_def.filename,
-                columns_of_interest,
-                chunk_size,
-                row_count,
+                columns=columns_of_interest,
+                quotechar=table_def.fields_enclosed_by,
+                chunk_size=chunk_size,
             )
 
         table_indexes = settings.indexes.get(table_def.name, [])
         if table_indexes:
-            create_indexes(engine, table_def.name, table_indexes)
+            create_indexes(
+                engine,
+                table_def.name,
+                table_indexes,
+                num_threads=num_threads,
+                maintenance_work_mem=settings.maintenance_work_mem,
+                existing_columns=schema_columns,
+            )
+
+        if use_pg:
+            # Tables are created UNLOGGED for the load; make them crash-safe now
+            # that data and indexes are in place (a no-op if already logged).
+            with engine.connect() as conn:
+                conn.execute(text(f"ALTER TABLE {table_def.name} SET LOGGED"))
+                conn.commit()
 
         console.print(
             f"[green]Inserted {human_readable_number(row_count)} rows"
@@ -335,8 +545,13 @@ def insert_data(
 # -- Display helpers (unchanged) --
 
 
-def display_query_results(session: Session) -> None:
-    """Display results of common queries."""
+def display_query_results(session: Session, *, use_taxa_table: bool = False) -> None:
+    """Display results of common queries.
+
+    With ``use_taxa_table``, per-taxon and family results come from the
+    ``taxa`` snapshot built by ``populate-taxa-table`` instead of being
+    aggregated from ``occurrence``.
+    """
     queries_to_run = [
         ("Count Occurrences per Taxon", queries.count_occurrences_per_taxon),
         ("Count Multimedia per Taxon", queries.count_multimedia_per_taxon),
@@ -346,15 +561,14 @@ def display_query_results(session: Session) -> None:
     ]
 
     for description, query_func in queries_to_run:
-        result = query_func(session)
+        rows = iter(query_func(session, use_taxa_table=use_taxa_table))
         table = RichTable(title=description)
-        if result:
-            first_row = result[0]
-            keys = first_row._fields
-            for key in keys:
+        first_row = next(rows, None)
+        if first_row is not None:
+            for key in first_row._fields:
                 table.add_column(key)
-            for row in result:
-                table.add_row(*[str(getattr(row, key)) for key in keys])
+            for row in chain([first_row], rows):
+                table.add_row(*map(str, row))
         else:
             table.add_column("No data found")
         console.print(table)
@@ -376,7 +590,7 @@ def display_random_samples(session: Session) -> None:
             if hidden_columns > 0:
                 table.add_column(f"[dim]{hidden_columns} more columns hidden[/dim]")
             for row in result:
-                table.add_row(*[str(getattr(row, key)) for key in display_keys])
+                table.add_row(*map(str, row[:max_columns]))
         else:
             table.add_column("No data found")
         console.print(table)
@@ -409,12 +623,10 @@ def convert(
         engine, session = create_engine_and_session(db_url)
 
         console.print("[cyan]Creating schema...[/cyan]")
-        create_schema_from_meta(engine, tables)
-
-        table_row_counts = estimate_and_display_row_counts(zip_ref, tables, num_threads)
+        create_schema_from_meta(engine, tables, unlogged=True)
 
         console.print("[cyan]Inserting data...[/cyan]")
-        insert_data(engine, session, zip_ref, tables, table_row_counts, chunk_size, num_threads)
+        insert_data(engine, zip_ref, tables, chunk_size, num_threads)
 
     console.print("[cyan]Summarizing SQL tables...[/cyan]")
     summarize_sql_tables(engine, session)
@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
-import re
 from typing import TYPE_CHECKING, Any
 
 import sqlalchemy as sa
 from rich.console import Console
-from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, event
 from sqlalchemy.orm import sessionmaker
 
-_SQL_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+# Applied to every SQLite connection: WAL + synchronous=NORMAL avoid an fsync
+# per commit, and a 256 MiB page cache keeps bulk loads and joins in memory.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-262144",
+)
 
 if TYPE_CHECKING:
     from sqlalchemy.engine import Engine
@@ -26,22 +32,40 @@ def validate_sql_identifier(name: str) -> str:
 
     Raises ValueError if the name contains characters outside [A-Za-z0-9_].
     """
-    if not _SQL_IDENTIFIER_RE.match(name):
+    # For ASCII strings isidentifier() is exactly [A-Za-z_][A-Za-z0-9_]*
+    if not (name.isascii() and name.isidentifier()):
         msg = f"Invalid SQL identifier: {name!r}"
         raise ValueError(msg)
     return name
 
 
+def _set_sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
 def create_engine_and_session(db_url: str) -> tuple[Engine, Session]:
     """Create SQLAlchemy engine and session from database URL."""
     engine = create_engine(db_url)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
     Session = sessionmaker(bind=engine)
     session = Session()
     return engine, session
 
 
-def create_table(metadata: MetaData, table_name: str, columns: list[ColumnDefinition]) -> Table:
-    """Create a SQLAlchemy table with the given columns."""
+def create_table(
+    metadata: MetaData,
+    table_name: str,
+    columns: list[ColumnDefinition],
+    prefixes: list[str] | None = None,
+) -> Table:
+    """Create a SQLAlchemy table with the given columns.
+
+    *prefixes* are rendered between ``CREATE`` and ``TABLE`` (e.g. ``UNLOGGED``).
+    """
     validate_sql_identifier(table_name)
     cols: list[Column[Any]] = [Column("id", Integer, primary_key=True, autoincrement=True)]
     for col in columns:
@@ -49,16 +73,24 @@ def create_table(metadata: MetaData, table_name: str, columns: list[ColumnDefini
             validate_sql_identifier(col.name)
             cols.append(Column(col.name, String))
 
-    table = Table(table_name, metadata, *cols, extend_existing=True)
+    table = Table(table_name, metadata, *cols, prefixes=prefixes or [], extend_existing=True)
     return table
 
 
-def create_schema_from_meta(engine: Engine, tables: list[TableDefinition]) -> list[Table]:
-    """Create database schema from meta.xml table definitions."""
+def create_schema_from_meta(
+    engine: Engine, tables: list[TableDefinition], unlogged: bool = False
+) -> list[Table]:
+    """Create database schema from meta.xml table definitions.
+
+    With *unlogged*, PostgreSQL tables are created ``UNLOGGED`` so bulk loads
+    skip WAL; callers switch them back with ``ALTER TABLE ... SET LOGGED``.
+    Ignored on other dialects.
+    """
     metadata = MetaData()
+    prefixes = ["UNLOGGED"] if unlogged and engine.dialect.name == "postgresql" else None
     created_tables = []
     for table_def in tables:
-        table = create_table(metadata, table_def.name, table_def.columns)
+        table = create_table(metadata, table_def.name, table_def.columns, prefixes)
         created_tables.append(table)
 
     metadata.create_all(engine)
@@ -73,17 +105,32 @@ def get_table_column_names(engine: Engine, table_name: str) -> set[str]:
 
 def summarize_sql_tables(engine: Engine, session: Session) -> None:
     """Print summary of database tables."""
-    inspector = sa.inspect(engine)
-    for table_name in inspector.get_table_names():
+    # One reflection pass for every table instead of an inspector call plus an
+    # autoload per table
+    metadata = MetaData()
+    metadata.reflect(bind=engine)
+    table_names = sorted(metadata.tables)
+
+    # All row counts in one round trip
+    row_counts: dict[str, int] = {}
+    if table_names:
+        counts = sa.union_all(
+            *(
+                sa.select(
+                    sa.literal(name).label("table_name"), sa.func.count().label("n")
+                ).select_from(metadata.tables[name])
+                for name in table_names
+            )
+        )
+        row_counts = dict(session.execute(counts).tuples().all())
+
+    for table_name in table_names:
         console.print(f"[cyan]Summary for table {table_name}:[/cyan]")
+        table = metadata.tables[table_name]
 
         # Print row count
-        table = Table(table_name, MetaData(), autoload_with=engine)
-        stmt = sa.select(sa.func.count()).select_from(table)
-        row_count = session.execute(stmt).scalar_one()
-        console.print(f"  - Rows: {row_count}")
+        console.print(f"  - Rows: {row_counts[table_name]}")
 
         # Print column names and types
-        columns = inspector.get_columns(table_name)
-        for column in columns:
-            console.print(f"  - {column['name']} ({column['type']})")
+        for column in table.columns:
+            console.print(f"  - {column.name} ({column.type})")
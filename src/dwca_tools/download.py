@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 import json
+import os
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, BinaryIO
 
 import requests
 import typer
+from requests.adapters import HTTPAdapter
 from rich.console import Console
 from rich.progress import (
     BarColumn,
@@ -17,10 +22,21 @@ from rich.progress import (
     TextColumn,
     TransferSpeedColumn,
 )
+from urllib3.util.retry import Retry
 
 from .settings import get_gbif_settings, resolve_password
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from concurrent.futures import Future
+
+    from rich.progress import TaskID
+
 GBIF_API = "https://api.gbif.org/v1/occurrence/download"
+INITIAL_POLL_INTERVAL = 5.0
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+DEFAULT_PARTS = 8
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
 
 console = Console()
 app = typer.Typer(no_args_is_help=True)
@@ -84,9 +100,14 @@ def build_predicate(
 # ---------------------------------------------------------------------------
 
 
+def unique_values(tokens: Iterable[str]) -> list[str]:
+    """Strip *tokens*, dropping blanks and repeats while keeping first-seen order."""
+    return list(dict.fromkeys(tok for tok in map(str.strip, tokens) if tok))
+
+
 def load_values_from_file(path: Path) -> list[str]:
-    """Read one value per line, skipping blanks."""
-    return [line.strip() for line in path.read_text().splitlines() if line.strip()]
+    """Read one value per line, skipping blanks and duplicates."""
+    return unique_values(path.read_text().splitlines())
 
 
 def load_extra_predicate(path: Path) -> dict[str, Any]:
@@ -99,6 +120,26 @@ def load_extra_predicate(path: Path) -> dict[str, Any]:
 # ---------------------------------------------------------------------------
 
 
+def get_session(pool_maxsize: int = DEFAULT_PARTS) -> requests.Session:
+    """Return a shared HTTP session so polls reuse one keep-alive connection.
+
+    Idempotent requests are retried on transient gateway errors. The pool
+    keeps at least *pool_maxsize* connections (never fewer than
+    ``DEFAULT_PARTS``) alive, so every worker of a ranged download can hand
+    its connection back instead of it being discarded.
+    """
+    return _cached_session(max(pool_maxsize, DEFAULT_PARTS))
+
+
+@lru_cache
+def _cached_session(pool_maxsize: int) -> requests.Session:
+    session = requests.Session()
+    retry = Retry(total=5, backoff_factor=1, status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    return session
+
+
 def build_request_body(
     predicate: dict[str, Any],
     username: str,
@@ -125,10 +166,9 @@ def submit_download_request(
     """Submit a download request to GBIF and return the download key."""
     url = f"{GBIF_API}/request"
     body = build_request_body(predicate, username, email, fmt)
-    resp = requests.post(
+    resp = get_session().post(
         url,
-        headers={"Content-Type": "application/json"},
-        data=json.dumps(body),
+        json=body,
         auth=(username, password),
         timeout=30,
     )
@@ -136,56 +176,289 @@ def submit_download_request(
     return resp.text.strip('"')
 
 
+# Last status document seen per download key, with its ETag, for conditional GETs.
+_status_cache: dict[str, tuple[str, dict[str, Any]]] = {}
+
+
 def get_download_status(key: str) -> dict[str, Any]:
-    """Return status information for download *key*."""
-    resp = requests.get(f"{GBIF_API}/{key}", timeout=30)
+    """Return status information for download *key*.
+
+    Repeat calls send ``If-None-Match`` so an unchanged status costs a 304
+    with no body; the previously parsed document is returned in that case.
+    """
+    headers = {}
+    cached = _status_cache.get(key)
+    if cached is not None:
+        headers["If-None-Match"] = cached[0]
+    resp = get_session().get(f"{GBIF_API}/{key}", headers=headers, timeout=30)
+    if resp.status_code == 304 and cached is not None:
+        return cached[1]
     resp.raise_for_status()
-    return resp.json()  # type: ignore[no-any-return]
+    info: dict[str, Any] = resp.json()
+    etag = resp.headers.get("etag")
+    if etag:
+        _status_cache[key] = (etag, info)
+    return info
+
+
+def _download_progress() -> Progress:
+    return Progress(
+        TextColumn("[bold blue]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+    )
 
 
-def stream_download_file(key: str, output_path: Path) -> None:
-    """Stream the completed archive to *output_path* with a Rich progress bar."""
-    url = f"{GBIF_API}/request/{key}.zip"
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+def _probe_download(url: str) -> tuple[str, int, bool, str | None]:
+    """HEAD *url* and return (final URL, size, supports ranges, ETag)."""
+    resp = get_session().head(url, allow_redirects=True, timeout=30)
+    resp.raise_for_status()
+    size = int(resp.headers.get("content-length", 0))
+    ranged = resp.headers.get("accept-ranges", "").lower() == "bytes"
+    return resp.url, size, ranged, resp.headers.get("etag")
+
+
+def _load_checkpoint(
+    ckpt_path: Path, *, size: int, etag: str | None, part_size: int, n_parts: int
+) -> set[int]:
+    """Return completed part indices from *ckpt_path* if it matches this download.
+
+    Part indices only map to the same byte ranges under the same *part_size*,
+    so a checkpoint written with another part size, or naming parts outside
+    ``range(n_parts)``, is discarded.
+    """
+    if not ckpt_path.exists():
+        return set()
+    try:
+        ckpt = json.loads(ckpt_path.read_text())
+    except (OSError, ValueError):
+        return set()
+    if (ckpt.get("size"), ckpt.get("etag"), ckpt.get("part_size")) != (size, etag, part_size):
+        return set()
+    done = ckpt.get("done", [])
+    if not all(isinstance(i, int) and 0 <= i < n_parts for i in done):
+        return set()
+    return set(done)
+
+
+def _save_checkpoint(
+    ckpt_path: Path, *, size: int, etag: str | None, part_size: int, done: set[int]
+) -> None:
+    """Atomically write the set of completed parts next to the output file."""
+    tmp_path = ckpt_path.with_name(ckpt_path.name + ".tmp")
+    ckpt = {"size": size, "etag": etag, "part_size": part_size, "done": sorted(done)}
+    tmp_path.write_text(json.dumps(ckpt))
+    tmp_path.replace(ckpt_path)
+
 
-    with requests.get(url, stream=True, timeout=30) as resp:
+def _preallocate(fh: BinaryIO, size: int) -> None:
+    """Size *fh* to *size* bytes, reserving the disk blocks up front where possible.
+
+    Ranges land in arbitrary order; preallocating keeps them in contiguous
+    extents instead of a sparse file filled piecemeal.
+    """
+    if size and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fh.fileno(), 0, size)
+            return
+        except OSError:
+            pass  # filesystem without fallocate support; fall back to a sparse file
+    fh.truncate(size)
+
+
+def _download_part(
+    url: str,
+    output_path: Path,
+    start: int,
+    end: int,
+    *,
+    session: requests.Session,
+    progress: Progress,
+    task: TaskID,
+) -> None:
+    """Fetch bytes *start*..*end* (inclusive) of *url* into the same offsets of *output_path*."""
+    headers = {"Range": f"bytes={start}-{end}"}
+    with session.get(url, headers=headers, stream=True, timeout=30) as resp:
+        resp.raise_for_status()
+        if resp.status_code != 206:
+            msg = f"Server ignored range request for bytes {start}-{end}"
+            raise requests.HTTPError(msg, response=resp)
+        with output_path.open("r+b") as fh:
+            fh.seek(start)
+            for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                fh.write(chunk)
+                progress.advance(task, len(chunk))
+
+
+def _parallel_download(
+    url: str,
+    output_path: Path,
+    *,
+    size: int,
+    etag: str | None,
+    parts: int,
+    part_size: int,
+) -> None:
+    """Download *url* as concurrent byte ranges, resuming from a checkpoint file.
+
+    If a part fails (or the download is interrupted), queued parts are
+    cancelled, the parts already in flight are allowed to finish, and every
+    part that completed is checkpointed before the error propagates.
+    """
+    ckpt_path = output_path.with_name(output_path.name + ".ckpt.json")
+    ranges = [(s, min(s + part_size, size) - 1) for s in range(0, size, part_size)]
+
+    done = _load_checkpoint(
+        ckpt_path, size=size, etag=etag, part_size=part_size, n_parts=len(ranges)
+    )
+    if not done or not output_path.exists() or output_path.stat().st_size != size:
+        done = set()
+        with output_path.open("wb") as fh:
+            _preallocate(fh, size)
+    else:
+        console.print(f"Resuming download: {len(done)}/{len(ranges)} parts already fetched")
+
+    session = get_session(parts)
+    with _download_progress() as progress:
+        task = progress.add_task("Downloading", total=size)
+        progress.advance(task, sum(ranges[i][1] - ranges[i][0] + 1 for i in done))
+        with ThreadPoolExecutor(max_workers=parts) as executor:
+            futures: dict[Future[None], int] = {
+                executor.submit(
+                    _download_part,
+                    url,
+                    output_path,
+                    start,
+                    end,
+                    session=session,
+                    progress=progress,
+                    task=task,
+                ): i
+                for i, (start, end) in enumerate(ranges)
+                if i not in done
+            }
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    done.add(futures[future])
+                    _save_checkpoint(
+                        ckpt_path, size=size, etag=etag, part_size=part_size, done=done
+                    )
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                wait(futures)
+                done.update(
+                    i
+                    for future, i in futures.items()
+                    if not future.cancelled() and future.exception() is None
+                )
+                _save_checkpoint(ckpt_path, size=size, etag=etag, part_size=part_size, done=done)
+                raise
+
+    ckpt_path.unlink(missing_ok=True)
+
+
+def _serial_download(url: str, output_path: Path) -> None:
+    """Stream *url* to *output_path* over a single connection."""
+    with get_session().get(url, stream=True, timeout=30) as resp:
         resp.raise_for_status()
         total = int(resp.headers.get("content-length", 0))
 
-        with Progress(
-            TextColumn("[bold blue]{task.description}"),
-            BarColumn(),
-            DownloadColumn(),
-            TransferSpeedColumn(),
-        ) as progress:
+        with _download_progress() as progress:
             task = progress.add_task("Downloading", total=total or None)
             with output_path.open("wb") as fh:
-                for chunk in resp.iter_content(chunk_size=8192):
+                for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
                     fh.write(chunk)
                     progress.advance(task, len(chunk))
 
 
+def stream_download_file(
+    key: str,
+    output_path: Path,
+    parts: int = DEFAULT_PARTS,
+    part_size: int = DEFAULT_PART_SIZE,
+) -> None:
+    """Download the completed archive to *output_path* with a Rich progress bar.
+
+    When the server advertises byte-range support and the archive is larger
+    than one part, up to *parts* ranges of *part_size* bytes are fetched
+    concurrently. Bytes land in ``<output>.part``, which is renamed over
+    *output_path* only once complete; ranged progress is checkpointed to
+    ``<output>.part.ckpt.json`` so an interrupted download resumes with only
+    the unfinished parts.
+    """
+    url = f"{GBIF_API}/request/{key}.zip"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = output_path.with_name(output_path.name + ".part")
+
+    final_url, size, ranged, etag = _probe_download(url)
+    if parts > 1 and ranged and size > part_size:
+        _parallel_download(
+            final_url, partial_path, size=size, etag=etag, parts=parts, part_size=part_size
+        )
+    else:
+        try:
+            _serial_download(final_url, partial_path)
+        except BaseException:
+            # A single stream cannot be resumed, so don't leave the fragment behind
+            partial_path.unlink(missing_ok=True)
+            raise
+    partial_path.replace(output_path)
+
+
+def _is_transient_error(exc: requests.RequestException) -> bool:
+    """Return True for connection problems and 5xx responses worth retrying.
+
+    Gateway errors are retried by the session itself, which raises
+    ``RetryError`` once its retries run out; that is transient too.
+    """
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is not None and exc.response.status_code >= 500
+    return isinstance(
+        exc, (requests.ConnectionError, requests.Timeout, requests.exceptions.RetryError)
+    )
+
+
 def poll_until_complete(
     key: str,
     poll_interval: int = 60,
     max_polls: int = 60,
+    initial_interval: float = INITIAL_POLL_INTERVAL,
 ) -> dict[str, Any]:
-    """Poll GBIF until the download succeeds, fails, or we hit *max_polls*."""
-    for i in range(max_polls):
-        info = get_download_status(key)
-        status = info.get("status", "UNKNOWN")
-        console.print(f"  Status: [bold]{status}[/bold]")
+    """Poll GBIF until the download succeeds, fails, or we hit *max_polls*.
 
-        if status == "SUCCEEDED":
-            return info
-        if status in {"KILLED", "CANCELLED", "FAILED"}:
-            reason = info.get("eraseReason", "unknown")
-            console.print(f"[red]Download failed: {reason}[/red]")
-            raise typer.Exit(code=1)
+    The wait starts at *initial_interval* and grows by 1.5x after each
+    successful check (2x after a failed one) up to *poll_interval*, so short
+    jobs are noticed quickly without hammering the API on long ones.
+    """
+    interval = min(initial_interval, poll_interval)
+    for i in range(max_polls):
+        growth = 1.5
+        try:
+            info = get_download_status(key)
+        except requests.RequestException as exc:
+            if not _is_transient_error(exc):
+                raise
+            console.print(f"  [yellow]Status check failed: {exc}[/yellow]")
+            growth = 2.0
+        else:
+            status = info.get("status", "UNKNOWN")
+            console.print(f"  Status: [bold]{status}[/bold]")
+
+            if status == "SUCCEEDED":
+                return info
+            if status in {"KILLED", "CANCELLED", "FAILED"}:
+                reason = info.get("eraseReason", "unknown")
+                console.print(f"[red]Download failed: {reason}[/red]")
+                raise typer.Exit(code=1)
 
         if i < max_polls - 1:
-            console.print(f"  Waiting {poll_interval}s before next check...")
-            time.sleep(poll_interval)
+            wait = interval * random.uniform(0.8, 1.2)
+            console.print(f"  Waiting {wait:.0f}s before next check...")
+            time.sleep(wait)
+            interval = min(interval * growth, poll_interval)
 
     console.print("[yellow]Max polls reached. Download may still be processing.[/yellow]")
     console.print(f"  Check status: {GBIF_API}/{key}")
@@ -222,8 +495,16 @@ def request(
     ),
     fmt: str = typer.Option("DWCA", "--format", help="DWCA, SIMPLE_CSV, or SPECIES_LIST"),
     output: Path | None = typer.Option(None, "--output", "-o", help="Output file path"),
+    parts: int = typer.Option(
+        DEFAULT_PARTS, "--parts", min=1, help="Concurrent connections for the archive download"
+    ),
+    part_size: int = typer.Option(
+        DEFAULT_PART_SIZE, "--part-size", min=1, help="Bytes per ranged request when downloading"
+    ),
     no_wait: bool = typer.Option(False, "--no-wait", help="Submit and exit without polling"),
-    poll_interval: int = typer.Option(60, "--poll-interval", help="Seconds between status checks"),
+    poll_interval: int = typer.Option(
+        60, "--poll-interval", help="Maximum seconds between status checks"
+    ),
     max_polls: int = typer.Option(60, "--max-polls", help="Maximum number of status checks"),
     username: str | None = typer.Option(None, "--username", help="GBIF username (overrides env)"),
     email: str | None = typer.Option(None, "--email", help="Notification email (overrides env)"),
@@ -237,7 +518,7 @@ def request(
     if taxa_file:
         values = load_values_from_file(taxa_file)
     elif taxon_keys:
-        values = [k.strip() for k in taxon_keys.split(",") if k.strip()]
+        values = unique_values(taxon_keys.split(","))
 
     if not values:
         console.print("[red]No taxon keys or names provided.[/red]")
@@ -274,7 +555,7 @@ def request(
     )
     try:
         key = submit_download_request(pred, user, password, mail, fmt)
-    except requests.HTTPError as exc:
+    except requests.RequestException as exc:
         console.print(f"[red]GBIF API error: {exc}[/red]")
         raise typer.Exit(code=1) from exc
 
@@ -285,7 +566,7 @@ def request(
         return
 
     # -- poll & fetch ----------------------------------------------------------
-    console.print(f"Polling every {poll_interval}s (max {max_polls} checks)...")
+    console.print(f"Polling up to every {poll_interval}s (max {max_polls} checks)...")
     info = poll_until_complete(key, poll_interval, max_polls)
 
     doi = info.get("doi")
@@ -296,7 +577,7 @@ def request(
         console.print(f"Records: {total_records:,}")
 
     out = output or Path(f"{key}.zip")
-    stream_download_file(key, out)
+    stream_download_file(key, out, parts, part_size)
     console.print(f"Saved to [bold]{out}[/bold]")
 
 
@@ -307,7 +588,7 @@ def status(
     """Check the status of a GBIF download."""
     try:
         info = get_download_status(download_key)
-    except requests.HTTPError as exc:
+    except requests.RequestException as exc:
         console.print(f"[red]Error: {exc}[/red]")
         raise typer.Exit(code=1) from exc
 
@@ -327,12 +608,18 @@ def status(
 def fetch(
     download_key: str = typer.Argument(..., help="GBIF download key"),
     output: Path | None = typer.Option(None, "--output", "-o", help="Output file path"),
+    parts: int = typer.Option(
+        DEFAULT_PARTS, "--parts", min=1, help="Concurrent connections for the archive download"
+    ),
+    part_size: int = typer.Option(
+        DEFAULT_PART_SIZE, "--part-size", min=1, help="Bytes per ranged request when downloading"
+    ),
 ) -> None:
     """Download a completed GBIF archive."""
     # Check it's ready first
     try:
         info = get_download_status(download_key)
-    except requests.HTTPError as exc:
+    except requests.RequestException as exc:
         console.print(f"[red]Error: {exc}[/red]")
         raise typer.Exit(code=1) from exc
 
@@ -342,5 +629,9 @@ def fetch(
         raise typer.Exit(code=1)
 
     out = output or Path(f"{download_key}.zip")
-    stream_download_file(download_key, out)
+    try:
+        stream_download_file(download_key, out, parts, part_size)
+    except requests.RequestException as exc:
+        console.print(f"[red]Download failed: {exc}[/red]")
+        raise typer.Exit(code=1) from exc
     console.print(f"Saved to [bold]{out}[/bold]")
@@ -3,31 +3,87 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
+from weakref import WeakKeyDictionary
 
 import sqlalchemy as sa
 from sqlalchemy import MetaData, Table, func, select
+from sqlalchemy.dialects.postgresql import REGCLASS
 
 if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine, Result
     from sqlalchemy.orm import Session
+    from sqlalchemy.sql import Select
 
+# Reflected tables per engine, so each table is introspected once per process
+# instead of once per query. Entries go away with their engine.
+_METADATA: WeakKeyDictionary[Engine, MetaData] = WeakKeyDictionary()
 
-def reflect_table(name: str, session: Session) -> Table:
-    """Reflect an existing database table by name."""
-    return Table(name, MetaData(), autoload_with=session.bind, extend_existing=True)
+# Pages read per requested row when sampling PostgreSQL tables; rows are
+# clustered within a page, so sampling several pages per row keeps the
+# sample spread across the table.
+TABLESAMPLE_PAGES_PER_ROW = 10
+
+# Rows buffered at a time by queries whose result grows with the data.
+STREAM_BATCH_SIZE = 10_000
 
 
-def count_occurrences_per_taxon(session: Session) -> Any:
+def reflect_table(name: str, session: Session) -> Table:
+    """Reflect an existing database table by name, reusing earlier reflections."""
+    bind = session.get_bind()
+    engine = bind if isinstance(bind, sa.Engine) else bind.engine
+    metadata = _METADATA.setdefault(engine, MetaData())
+    if name in metadata.tables:
+        return metadata.tables[name]
+    return Table(name, metadata, autoload_with=engine)
+
+
+def _stream(session: Session, query: Select[Any]) -> Result[Any]:
+    """Execute *query* and return its rows as a stream rather than a list.
+
+    Used for results with one row per taxon or family, which can number in
+    the millions on full GBIF archives; rows are fetched (server-side on
+    PostgreSQL) in batches of ``STREAM_BATCH_SIZE``.
+    """
+    return session.execute(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+
+
+def _taxa_counts(session: Session, *, use_taxa_table: bool) -> Table | None:
+    """Return the ``taxa`` aggregate table when asked to answer queries from it.
+
+    Its per-taxon counts answer the taxon and family queries below without
+    re-aggregating ``occurrence``, but they are a snapshot from the last
+    ``populate-taxa-table`` run rather than live counts: rows added since
+    then are missed, occurrences without a ``taxonID`` are left out, and
+    each taxon is filed under one family (the smallest it was recorded
+    with). Callers therefore opt in with ``use_taxa_table``; without the
+    table, queries fall back to aggregating ``occurrence``.
+    """
+    if not use_taxa_table or not sa.inspect(session.connection()).has_table("taxa"):
+        return None
+    return reflect_table("taxa", session)
+
+
+def count_occurrences_per_taxon(session: Session, *, use_taxa_table: bool = False) -> Result[Any]:
     """Count occurrences per taxon."""
+    taxa = _taxa_counts(session, use_taxa_table=use_taxa_table)
+    if taxa is not None:
+        query = select(taxa.c.taxonID, taxa.c.occurrences_count.label("occurrence_count"))
+        return _stream(session, query)
     occurrence = reflect_table("occurrence", session)
     query = select(occurrence.c.taxonID, func.count().label("occurrence_count")).group_by(
         occurrence.c.taxonID
     )
-    result = session.execute(query).fetchall()
-    return result
+    return _stream(session, query)
 
 
-def count_multimedia_per_taxon(session: Session) -> Any:
+def count_multimedia_per_taxon(session: Session, *, use_taxa_table: bool = False) -> Result[Any]:
     """Count multimedia entries per taxon."""
+    taxa = _taxa_counts(session, use_taxa_table=use_taxa_table)
+    if taxa is not None:
+        query = select(taxa.c.taxonID, taxa.c.multimedia_count.label("multimedia_count")).where(
+            taxa.c.multimedia_count > 0
+        )
+        return _stream(session, query)
     occurrence = reflect_table("occurrence", session)
     multimedia = reflect_table("multimedia", session)
     query = (
@@ -38,12 +94,19 @@ def count_multimedia_per_taxon(session: Session) -> Any:
         .join(multimedia, occurrence.c.gbifID == multimedia.c.gbifID)
         .group_by(occurrence.c.taxonID)
     )
-    result = session.execute(query).fetchall()
-    return result
+    return _stream(session, query)
 
 
-def highest_occurrences(session: Session, limit: int = 10) -> Any:
+def highest_occurrences(session: Session, limit: int = 10, *, use_taxa_table: bool = False) -> Any:
     """Get taxa with highest occurrence counts."""
+    taxa = _taxa_counts(session, use_taxa_table=use_taxa_table)
+    if taxa is not None:
+        query = (
+            select(taxa.c.taxonID, taxa.c.occurrences_count.label("occurrence_count"))
+            .order_by(taxa.c.occurrences_count.desc())
+            .limit(limit)
+        )
+        return session.execute(query).fetchall()
     occurrence = reflect_table("occurrence", session)
     query = (
         select(occurrence.c.taxonID, func.count().label("occurrence_count"))
@@ -55,8 +118,17 @@ def highest_occurrences(session: Session, limit: int = 10) -> Any:
     return result
 
 
-def highest_multimedia(session: Session, limit: int = 10) -> Any:
+def highest_multimedia(session: Session, limit: int = 10, *, use_taxa_table: bool = False) -> Any:
     """Get taxa with highest multimedia counts."""
+    taxa = _taxa_counts(session, use_taxa_table=use_taxa_table)
+    if taxa is not None:
+        query = (
+            select(taxa.c.taxonID, taxa.c.multimedia_count.label("multimedia_count"))
+            .where(taxa.c.multimedia_count > 0)
+            .order_by(taxa.c.multimedia_count.desc())
+            .limit(limit)
+        )
+        return session.execute(query).fetchall()
     occurrence = reflect_table("occurrence", session)
     multimedia = reflect_table("multimedia", session)
     query = (
@@ -73,41 +145,73 @@ def highest_multimedia(session: Session, limit: int = 10) -> Any:
     return result
 
 
-def taxa_with_no_entries(session: Session) -> Any:
+def taxa_with_no_entries(session: Session) -> Result[Any]:
     """Get taxa with no occurrences or multimedia."""
     taxa = reflect_table("taxa", session)
     query = select(taxa.c.taxonID).where(
         (taxa.c.occurrences_count == 0) | (taxa.c.multimedia_count == 0)
     )
-    result = session.execute(query).fetchall()
-    return result
+    return _stream(session, query)
 
 
-def family_summary(session: Session) -> Any:
+def family_summary(session: Session, *, use_taxa_table: bool = False) -> Result[Any]:
     """Get summary of occurrence counts by family."""
+    taxa = _taxa_counts(session, use_taxa_table=use_taxa_table)
+    if taxa is not None:
+        query = select(
+            taxa.c.family, func.sum(taxa.c.occurrences_count).label("family_count")
+        ).group_by(taxa.c.family)
+        return _stream(session, query)
     occurrence = reflect_table("occurrence", session)
     query = select(occurrence.c.family, func.count().label("family_count")).group_by(
         occurrence.c.family
     )
-    result = session.execute(query).fetchall()
-    return result
+    return _stream(session, query)
+
+
+def _pg_page_count(session: Session, table_name: str) -> int:
+    """Return the on-disk page count of a PostgreSQL table (no ANALYZE needed)."""
+    relation = sa.cast(func.quote_ident(table_name), REGCLASS)
+    query = select(
+        func.pg_relation_size(relation) / sa.cast(func.current_setting("block_size"), sa.Integer)
+    )
+    return int(session.execute(query).scalar_one())
 
 
 def random_sample_from_table(session: Session, table_name: str, limit: int = 5) -> Any:
-    """Get random sample of rows from a table."""
+    """Get random sample of rows from a table.
+
+    ``ORDER BY random()`` over full rows sorts the whole table, so large tables
+    are narrowed first: SQLite shuffles only rowids, and PostgreSQL shuffles
+    the rows of a few randomly chosen pages (``TABLESAMPLE SYSTEM``), falling
+    back to the full sort if the pages came up short.
+    """
     table = reflect_table(table_name, session)
-    query = select(table).order_by(sa.func.random()).limit(limit)
+    query = select(table).order_by(func.random()).limit(limit)
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        rowid = sa.literal_column("rowid")
+        picked = select(rowid).select_from(table).order_by(func.random()).limit(limit)
+        query = select(table).where(rowid.in_(picked))
+    elif dialect == "postgresql":
+        pages = _pg_page_count(session, table_name)
+        sample_pages = TABLESAMPLE_PAGES_PER_ROW * limit
+        if pages > sample_pages:
+            sampled = sa.tablesample(table, 100.0 * sample_pages / pages)
+            result = session.execute(
+                select(sampled).order_by(func.random()).limit(limit)
+            ).fetchall()
+            if len(result) == limit:
+                return result
     result = session.execute(query).fetchall()
     return result
 
 
 def random_sample_from_all_tables(session: Session) -> dict[str, Any]:
-    """Get random samples from all tables in the database."""
-    inspector = sa.inspect(session.bind)
-    if inspector is None:
-        return {}
-    table_names = inspector.get_table_names()
-    samples = {}
-    for table_name in table_names:
-        samples[table_name] = random_sample_from_table(session, table_name)
-    return samples
+    """Get random samples from all tables in the database.
+
+    Table listing and every sample query run on the session's connection, so
+    the whole pass is one checkout and one transaction.
+    """
+    table_names = sa.inspect(session.connection()).get_table_names()
+    return {name: random_sample_from_table(session, name) for name in table_names}
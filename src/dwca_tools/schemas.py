@@ -15,11 +15,15 @@ class ColumnDefinition:
 
 @dataclasses.dataclass(frozen=True, slots=True)
 class TableDefinition:
-    """A table discovered in meta.xml with its filename and columns."""
+    """A table discovered in meta.xml with its filename and columns.
+
+    ``fields_enclosed_by`` is meta.xml's quote character; empty means unquoted.
+    """
 
     name: str
     filename: str
     columns: list[ColumnDefinition]
+    fields_enclosed_by: str = '"'
 
     @property
     def column_names(self) -> list[str]:
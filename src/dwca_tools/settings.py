@@ -72,6 +72,10 @@ class ConvertSettings(BaseSettings):
         "verbatim": ["gbifID", "verbatimScientificName", "eventDate"],
         "multimedia": ["gbifID", "identifier", "created"],
     }
+    # PostgreSQL only: memory per index build, e.g. "1GB" for large loads. None keeps
+    # the server default. Indexes are built on up to num_threads connections at once,
+    # each with this much, so peak use can reach num_threads * maintenance_work_mem.
+    maintenance_work_mem: str | None = None
 
 
 @lru_cache
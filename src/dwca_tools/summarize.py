@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import xml.etree.ElementTree as ET
 import zipfile
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
@@ -16,6 +18,7 @@ from .schemas import ColumnDefinition, TableDefinition
 from .utils import human_readable_number, human_readable_size
 
 if TYPE_CHECKING:
+    from typing import IO
     from zipfile import ZipFile
 
 app = typer.Typer(no_args_is_help=True)
@@ -24,6 +27,9 @@ console = Console()
 
 DEFAULT_AVERAGE_LINE_LENGTH = 300
 
+# Files listed per directory by summarize_zip before the rest are summarized.
+DIRECTORY_SAMPLE_SIZE = 5
+
 
 def estimate_line_count(file_size: int, average_line_length: int) -> int:
     """Estimate number of lines in a file based on average line length."""
@@ -31,20 +37,26 @@ def estimate_line_count(file_size: int, average_line_length: int) -> int:
 
 
 def summarize_zip(zip_ref: ZipFile) -> None:
-    """Print summary of zip file contents."""
-    file_info_list = zip_ref.infolist()
+    """Print summary of zip file contents.
+
+    Files inside directories are only counted past the first
+    ``DIRECTORY_SAMPLE_SIZE`` per directory, so only displayed rows are kept
+    and formatted.
+    """
     root_files: list[tuple[str, int]] = []
-    dir_files: dict[str, list[tuple[str, int]]] = {}
+    dir_samples: dict[str, list[tuple[str, int]]] = {}
+    dir_counts: Counter[str] = Counter()
 
-    for file_info in file_info_list:
+    for file_info in zip_ref.infolist():
         filepath = file_info.filename
-        if "/" not in filepath:
+        directory, sep, _ = filepath.partition("/")
+        if not sep:
             root_files.append((filepath, file_info.file_size))
-        else:
-            directory = filepath.split("/")[0]
-            if directory not in dir_files:
-                dir_files[directory] = []
-            dir_files[directory].append((filepath, file_info.file_size))
+            continue
+        dir_counts[directory] += 1
+        samples = dir_samples.setdefault(directory, [])
+        if len(samples) < DIRECTORY_SAMPLE_SIZE:
+            samples.append((filepath, file_info.file_size))
 
     table = Table(title="Summary of the Zip File")
     table.add_column("Path", justify="left", style="cyan")
@@ -57,81 +69,89 @@ def summarize_zip(zip_ref: ZipFile) -> None:
             human_readable_size(size),
         )
 
-    for directory, files in dir_files.items():
-        if len(files) > 5:
-            for filepath, size in files[:5]:
-                table.add_row(
-                    filepath,
-                    human_readable_size(size),
-                )
-            table.add_row(f"{directory}/", f"{len(files)} files (sample shown above)", "-")
-        else:
-            for filepath, size in files:
-                table.add_row(
-                    filepath,
-                    human_readable_size(size),
-                )
+    for directory, files in dir_samples.items():
+        for filepath, size in files:
+            table.add_row(
+                filepath,
+                human_readable_size(size),
+            )
+        if dir_counts[directory] > DIRECTORY_SAMPLE_SIZE:
+            table.add_row(
+                f"{directory}/", f"{dir_counts[directory]} files (sample shown above)", "-"
+            )
 
     console.print(table)
     console.print(
-        "[cyan]Total files:[/cyan]"
-        f" {human_readable_number(len(root_files) + sum(len(files) for files in dir_files.values()))}"
+        f"[cyan]Total files:[/cyan] {human_readable_number(len(root_files) + dir_counts.total())}"
     )
-    console.print(f"[cyan]Total directories:[/cyan] {human_readable_number(len(dir_files))}")
+    console.print(f"[cyan]Total directories:[/cyan] {human_readable_number(len(dir_samples))}")
 
 
+@lru_cache(maxsize=1024)
 def extract_name_from_term(term: str) -> str:
     """Extract the last component of a term URI."""
     return term.rsplit("/", maxsplit=1)[-1]
 
 
+@lru_cache(maxsize=1024)
 def extract_table_name_from_rowtype(rowtype: str) -> str:
     """Extract table name from rowtype URI."""
     return rowtype.rsplit("/", maxsplit=1)[-1].lower()
 
 
+@lru_cache(maxsize=1024)
 def extract_table_name_from_filename(filename: str) -> str:
     """Extract table name from filename."""
     return urlparse(filename).path.split("/")[-1].split(".")[0].lower()
 
 
-def summarize_tables(zip_ref: ZipFile, meta_filename: str = "meta.xml") -> list[TableDefinition]:
-    """Parse meta.xml and return table definitions."""
-    console.print("[cyan]Parsing meta.xml to get table definitions.[/cyan]")
-    with zip_ref.open(meta_filename) as meta_file:
-        tree = ET.parse(meta_file)
-    root = tree.getroot()
+DWC_TEXT_NS = "{http://rs.tdwg.org/dwc/text/}"
+_CORE_TAG = f"{DWC_TEXT_NS}core"
+_EXTENSION_TAG = f"{DWC_TEXT_NS}extension"
+_FIELD_TAG = f"{DWC_TEXT_NS}field"
+_LOCATION_TAG = f"{DWC_TEXT_NS}location"
+
 
-    namespace = {"dwc": "http://rs.tdwg.org/dwc/text/"}
+def parse_meta_tables(meta_file: IO[bytes]) -> list[TableDefinition]:
+    """Parse table definitions from a meta.xml stream in one pass.
 
+    ``<field>`` and ``<location>`` elements are collected as they close and
+    handed to the enclosing ``<core>``/``<extension>`` when it closes, after
+    which that element is cleared. The core table is always listed first.
+    """
     tables: list[TableDefinition] = []
-    core = root.find("dwc:core", namespace)
-    if core is not None:
-        filename_el = core.find("dwc:files/dwc:location", namespace)
-        filename = filename_el.text if filename_el is not None and filename_el.text else "Unknown"
-        table_name = extract_table_name_from_filename(filename)
-
-        columns: list[ColumnDefinition] = []
-        for field in core.findall("dwc:field", namespace):
-            index = field.get("index")
-            term = field.get("term")
+    columns: list[ColumnDefinition] = []
+    location: str | None = None
+    for _event, elem in ET.iterparse(meta_file):
+        tag = elem.tag
+        if tag == _FIELD_TAG:
+            term = elem.get("term")
             if term:
-                column_name = extract_name_from_term(term)
-                columns.append(ColumnDefinition(index=index, name=column_name))
-        tables.append(TableDefinition(name=table_name, filename=filename, columns=columns))
-
-    for extension in root.findall("dwc:extension", namespace):
-        filename_el = extension.find("dwc:files/dwc:location", namespace)
-        filename = filename_el.text if filename_el is not None and filename_el.text else "Unknown"
-        table_name = extract_table_name_from_filename(filename)
-        columns = []
-        for field in extension.findall("dwc:field", namespace):
-            index = field.get("index")
-            term = field.get("term")
-            if term:
-                column_name = extract_name_from_term(term)
-                columns.append(ColumnDefinition(index=index, name=column_name))
-        tables.append(TableDefinition(name=table_name, filename=filename, columns=columns))
+                columns.append(
+                    ColumnDefinition(index=elem.get("index"), name=extract_name_from_term(term))
+                )
+        elif tag == _LOCATION_TAG:
+            if location is None:
+                location = elem.text or None
+        elif tag in (_CORE_TAG, _EXTENSION_TAG):
+            filename = location or "Unknown"
+            table_def = TableDefinition(
+                name=extract_table_name_from_filename(filename),
+                filename=filename,
+                columns=columns,
+                fields_enclosed_by=elem.get("fieldsEnclosedBy", '"'),
+            )
+            tables.insert(0 if tag == _CORE_TAG else len(tables), table_def)
+            columns, location = [], None
+            elem.clear()
+    return tables
+
+
+def summarize_tables(zip_ref: ZipFile, meta_filename: str = "meta.xml") -> list[TableDefinition]:
+    """Parse meta.xml and return table definitions."""
+    console.print("[cyan]Parsing meta.xml to get table definitions.[/cyan]")
+    with zip_ref.open(meta_filename) as meta_file:
+        tables = parse_meta_tables(meta_file)
 
     if not tables:
         console.print("[yellow]No tables found in meta.xml.[/yellow]")
@@ -5,12 +5,16 @@ from __future__ import annotations
 import csv
 import dataclasses
 import enum
+import heapq
 import io
 import json
 import sys
 import zipfile
-from collections import defaultdict
-from typing import TYPE_CHECKING
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from itertools import chain
+from operator import itemgetter
+from typing import IO, TYPE_CHECKING, Any
 
 import typer
 from rich.console import Console
@@ -21,38 +25,122 @@ from .schemas import TaxaResult
 from .summarize import summarize_tables
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Generator, Iterable, Mapping
+    from concurrent.futures import Future
     from zipfile import ZipFile
 
 console = Console()
 
+# Bytes of whole lines handed to each worker when aggregating in parallel.
+PARALLEL_CHUNK_BYTES = 8 << 20
+# Bytes of whole lines decoded at a time when reading a member serially.
+READ_BLOCK_SIZE = 1 << 20
+# Rows shown in the Rich table when --limit is not given; Rich spends about
+# half a millisecond laying out each row, so unbounded tables take minutes.
+TABLE_ROW_LIMIT = 1000
 
-def _read_table_as_dicts(
-    zip_ref: ZipFile, filename: str, columns: list[str]
-) -> Generator[dict[str, str], None, None]:
-    """Yield rows as dicts from a tab-delimited file inside a zip.
 
-    Only includes keys listed in *columns* that exist in the file header.
+def _column_positions(header: list[str], columns: list[str]) -> tuple[list[int], int]:
+    """Return the index of each of *columns* in *header* and the padded row width.
+
+    Absent columns point past the header, into the padding ``_pick_columns`` adds.
+    """
+    missing = list(dict.fromkeys(col for col in columns if col not in header))
+    positions = [
+        header.index(col) if col in header else len(header) + missing.index(col) for col in columns
+    ]
+    return positions, len(header) + len(missing)
+
+
+def _pick_columns(
+    rows: Iterable[list[str]], positions: list[int], width: int
+) -> Generator[tuple[str, ...], None, None]:
+    """Yield the values at *positions* from each row, padding short rows with ``""``."""
+    pick = itemgetter(*positions) if len(positions) > 1 else lambda row: (row[positions[0]],)
+    for row in rows:
+        if len(row) < width:
+            row.extend([""] * (width - len(row)))
+        yield pick(row)
+
+
+def _line_blocks(raw: IO[bytes], size: int) -> Generator[bytes, None, None]:
+    """Yield blocks of about *size* bytes from *raw*, each ending at a line break.
+
+    Each block is cut at the last newline of one ``read``, found with
+    ``bytes.rfind``, and the partial line after it starts the next block, so
+    no per-line objects are created here.
+    """
+    tail = b""
+    while block := raw.read(size):
+        end = block.rfind(b"\n") + 1
+        if not end:
+            tail += block
+            continue
+        yield tail + block[:end]
+        tail = block[end:]
+    if tail:
+        yield tail
+
+
+def _block_lines(block: bytes) -> list[str]:
+    """Decode a block of whole lines and split it into lines, without line breaks."""
+    lines = block.decode("utf-8").split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def _chunk_rows(
+    chunk: bytes, positions: list[int], width: int
+) -> Generator[tuple[str, ...], None, None]:
+    """Yield the picked columns of each line in a block of whole, undecoded lines."""
+    rows = (line.rstrip("\r").split("\t") for line in _block_lines(chunk))
+    return _pick_columns(rows, positions, width)
+
+
+def _read_header(raw: IO[bytes]) -> list[str]:
+    """Read and split the header line of an unquoted tab-delimited member."""
+    return raw.readline().decode("utf-8").rstrip("\r\n").split("\t")
+
+
+def _read_columns(
+    zip_ref: ZipFile, filename: str, columns: list[str], quotechar: str = ""
+) -> Generator[tuple[str, ...], None, None]:
+    """Yield the values of *columns* from each row of a tab-delimited file in a zip.
+
+    Lines are split on tabs unless *quotechar* (meta.xml's ``fieldsEnclosedBy``)
+    is set, in which case ``csv.reader`` handles the quoting. Unquoted members
+    are decoded a block of lines at a time rather than through a
+    ``TextIOWrapper``. Columns missing from the header, and fields missing from
+    short rows, come back as ``""``.
     """
     with zip_ref.open(filename, "r") as raw:
-        text_file = io.TextIOWrapper(raw, encoding="utf-8")
-        reader = csv.reader(text_file, delimiter="\t")
-        header = next(reader)
-        # Map column name -> index for the columns we care about
-        col_indices = {col: header.index(col) for col in columns if col in header}
-        for row in reader:
-            yield {col: row[idx] for col, idx in col_indices.items() if idx < len(row)}
+        if quotechar:
+            text_file = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            rows = csv.reader(text_file, delimiter="\t", quotechar=quotechar)
+            positions, width = _column_positions(next(rows, []), columns)
+            yield from _pick_columns(rows, positions, width)
+            return
+        positions, width = _column_positions(_read_header(raw), columns)
+        lines = chain.from_iterable(map(_block_lines, _line_blocks(raw, READ_BLOCK_SIZE)))
+        yield from _pick_columns(
+            (line.rstrip("\r").split("\t") for line in lines), positions, width
+        )
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class _TaxaGroup:
-    """Accumulator for per-group taxa stats."""
+    """Accumulator for per-group taxa stats.
+
+    The distinct taxonID/name sets stay ``None`` unless an aggregation that
+    needs them fills them in, so plain counting allocates no sets for them.
+    """
 
-    gbif_ids: set[str] = dataclasses.field(default_factory=set)
     count: int = 0
-    taxon_ids: set[str] = dataclasses.field(default_factory=set)
-    sci_names: set[str] = dataclasses.field(default_factory=set)
+    image_count: int = 0
     taxon_ranks: set[str] = dataclasses.field(default_factory=set)
+    taxon_ids: set[str] | None = None
+    sci_names: set[str] | None = None
 
 
 class GroupByColumn(enum.StrEnum):
@@ -70,85 +158,238 @@ class OutputFormat(enum.StrEnum):
     json = "json"
 
 
-def _aggregate_occurrences(  # noqa: PLR0912
+def _groups_from_tallies(
+    tallies: Counter[tuple[str, ...]], species_only: bool
+) -> dict[str, _TaxaGroup]:
+    """Fold ``(group, taxonRank)`` row tallies into per-group entries."""
+    groups: dict[str, _TaxaGroup] = defaultdict(_TaxaGroup)
+    for (key, rank), count in tallies.items():
+        if species_only and rank.upper() != "SPECIES":
+            continue
+        entry = groups[key]
+        entry.count += count
+        if rank:
+            # Few distinct ranks exist, but each tally holds its own copy.
+            entry.taxon_ranks.add(sys.intern(rank))
+    return groups
+
+
+def _aggregate_rows(
+    rows: Iterable[tuple[str, ...]],
+    show_mismatched_names: bool,
+    species_only: bool,
+    image_counts: Mapping[str, int] | None,
+) -> dict[str, _TaxaGroup]:
+    """Build per-group entries from ``(group, rank, gbifID, taxonID, name)`` rows."""
+
+    def new_group() -> _TaxaGroup:
+        if show_mismatched_names:
+            return _TaxaGroup(taxon_ids=set(), sci_names=set())
+        return _TaxaGroup()
+
+    groups: dict[str, _TaxaGroup] = defaultdict(new_group)
+    for key, rank, gbif_id, tid, sn in rows:
+        if species_only and rank.upper() != "SPECIES":
+            continue
+        entry = groups[key]
+        entry.count += 1
+        # Values kept in the sets recur across groups; intern them once, on
+        # first sight in a group, so each distinct string is stored once.
+        if rank and rank not in entry.taxon_ranks:
+            entry.taxon_ranks.add(sys.intern(rank))
+        if image_counts is not None and gbif_id:
+            entry.image_count += image_counts.get(gbif_id, 0)
+        ids, names = entry.taxon_ids, entry.sci_names
+        if ids is not None and tid and tid not in ids:
+            ids.add(sys.intern(tid))
+        if names is not None and sn and sn not in names:
+            names.add(sys.intern(sn))
+    return groups
+
+
+def _union(total: set[str] | None, part: set[str] | None) -> set[str] | None:
+    """Merge the value set *part* into *total*, either of which may be unset."""
+    if total is None:
+        return part
+    if part:
+        total |= part
+    return total
+
+
+def _merge_groups(groups: dict[str, _TaxaGroup], part: Mapping[str, _TaxaGroup]) -> None:
+    """Add the per-group entries of a partial aggregation into *groups*."""
+    for key, entry in part.items():
+        total = groups.get(key)
+        if total is None:
+            groups[key] = entry
+            continue
+        total.count += entry.count
+        total.image_count += entry.image_count
+        total.taxon_ranks |= entry.taxon_ranks
+        total.taxon_ids = _union(total.taxon_ids, entry.taxon_ids)
+        total.sci_names = _union(total.sci_names, entry.sci_names)
+
+
+# Images per gbifID for _aggregate_chunk, set once per worker process.
+_worker_image_counts: Mapping[str, int] | None = None
+
+
+def _init_worker(image_counts: Mapping[str, int] | None) -> None:
+    global _worker_image_counts  # noqa: PLW0603
+    _worker_image_counts = image_counts
+
+
+def _tally_chunk(chunk: bytes, positions: list[int], width: int) -> Counter[tuple[str, ...]]:
+    """Worker: tally the ``(group, taxonRank)`` rows of a block of lines."""
+    return Counter(_chunk_rows(chunk, positions, width))
+
+
+def _aggregate_chunk(
+    chunk: bytes, positions: list[int], width: int, show_mismatched_names: bool, species_only: bool
+) -> dict[str, _TaxaGroup]:
+    """Worker: aggregate the occurrence rows of a block of lines."""
+    rows = _chunk_rows(chunk, positions, width)
+    # A plain dict: the defaultdict's factory is a closure and cannot be pickled.
+    return dict(_aggregate_rows(rows, show_mismatched_names, species_only, _worker_image_counts))
+
+
+def _aggregate_in_processes(
+    zip_ref: ZipFile,
+    occ_filename: str,
+    columns: list[str],
+    jobs: int,
+    *,
+    show_mismatched_names: bool,
+    species_only: bool,
+    image_counts: Mapping[str, int] | None,
+) -> dict[str, _TaxaGroup]:
+    """Aggregate occurrences in *jobs* worker processes, one block of lines per task.
+
+    This process inflates the member and cuts it into blocks of whole lines
+    while the workers split and aggregate them; capping the tasks in flight
+    keeps memory at O(jobs * PARALLEL_CHUNK_BYTES). Partial results are
+    merged as they complete.
+    """
+    tally = not show_mismatched_names and image_counts is None
+    tallies: Counter[tuple[str, ...]] = Counter()
+    groups: dict[str, _TaxaGroup] = {}
+
+    def merge(done: Iterable[Future[Any]]) -> None:
+        for future in done:
+            if tally:
+                tallies.update(future.result())
+            else:
+                _merge_groups(groups, future.result())
+
+    with (
+        zip_ref.open(occ_filename, "r") as raw,
+        ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(image_counts,)) as executor,
+    ):
+        positions, width = _column_positions(_read_header(raw), columns)
+        pending: set[Future[Any]] = set()
+        for chunk in _line_blocks(raw, PARALLEL_CHUNK_BYTES):
+            if len(pending) >= 2 * jobs:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                merge(done)
+            if tally:
+                pending.add(executor.submit(_tally_chunk, chunk, positions, width))
+            else:
+                pending.add(
+                    executor.submit(
+                        _aggregate_chunk,
+                        chunk,
+                        positions,
+                        width,
+                        show_mismatched_names,
+                        species_only,
+                    )
+                )
+        merge(as_completed(pending))
+    return _groups_from_tallies(tallies, species_only) if tally else groups
+
+
+def _aggregate_occurrences(
     zip_ref: ZipFile,
     occ_filename: str,
     group_col: str,
     show_mismatched_names: bool,
     species_only: bool = False,
-    collect_gbif_ids: bool = False,
+    *,
+    image_counts: Mapping[str, int] | None = None,
+    quotechar: str = "",
+    jobs: int = 1,
 ) -> dict[str, _TaxaGroup]:
     """Stream occurrence CSV and build per-group aggregation.
 
-    When *collect_gbif_ids* is False (the default), gbifID values are not
-    stored, keeping memory usage proportional to the number of unique groups
-    rather than the number of occurrences.
-    """
-    needed_cols = [group_col]
-    if collect_gbif_ids:
-        needed_cols.append("gbifID")
-    if show_mismatched_names:
-        for col in ("taxonID", "scientificName"):
-            if col not in needed_cols:
-                needed_cols.append(col)
-    if "taxonRank" not in needed_cols:
-        needed_cols.append("taxonRank")
+    If *image_counts* (images per gbifID, from ``_aggregate_images``) is given,
+    each occurrence's images are added to its group as the row streams past,
+    so memory stays proportional to the number of groups and multimedia
+    records rather than the number of occurrences.
 
-    groups: dict[str, _TaxaGroup] = defaultdict(_TaxaGroup)
-    for row in _read_table_as_dicts(zip_ref, occ_filename, needed_cols):
-        if species_only and row.get("taxonRank", "").upper() != "SPECIES":
-            continue
-        key = row.get(group_col, "")
-        entry = groups[key]
-        entry.count += 1
-        rank = row.get("taxonRank", "")
-        if rank:
-            entry.taxon_ranks.add(rank)
-        if collect_gbif_ids:
-            gbif_id = row.get("gbifID", "")
-            if gbif_id:
-                entry.gbif_ids.add(gbif_id)
-        if show_mismatched_names:
-            tid = row.get("taxonID", "")
-            if tid:
-                entry.taxon_ids.add(tid)
-            sn = row.get("scientificName", "")
-            if sn:
-                entry.sci_names.add(sn)
-    return groups
+    Without the optional flags, rows are tallied by ``(group, taxonRank)``
+    with a ``Counter`` in C, and the species filter is applied to the tallies
+    rather than to every row.
+
+    With *jobs* > 1, rows are aggregated in that many worker processes. Quoted
+    archives are always read serially, since a quoted field may span lines.
+    """
+    tally = not show_mismatched_names and image_counts is None
+    columns = [group_col, "taxonRank"]
+    if not tally:
+        columns += ["gbifID", "taxonID", "scientificName"]
+    if jobs > 1 and not quotechar:
+        return _aggregate_in_processes(
+            zip_ref,
+            occ_filename,
+            columns,
+            jobs,
+            show_mismatched_names=show_mismatched_names,
+            species_only=species_only,
+            image_counts=image_counts,
+        )
+    rows = _read_columns(zip_ref, occ_filename, columns, quotechar)
+    if tally:
+        return _groups_from_tallies(Counter(rows), species_only)
+    return _aggregate_rows(rows, show_mismatched_names, species_only, image_counts)
 
 
-def _aggregate_images(zip_ref: ZipFile, mm_filename: str) -> dict[str, int]:
+def _aggregate_images(zip_ref: ZipFile, mm_filename: str, quotechar: str = "") -> dict[str, int]:
     """Stream multimedia CSV and count images per gbifID."""
-    counts: dict[str, int] = defaultdict(int)
-    for row in _read_table_as_dicts(zip_ref, mm_filename, ["gbifID"]):
-        gbif_id = row.get("gbifID", "")
-        if gbif_id:
-            counts[gbif_id] += 1
+    rows = _read_columns(zip_ref, mm_filename, ["gbifID"], quotechar)
+    counts = Counter(chain.from_iterable(rows))
+    counts.pop("", None)
     return counts
 
 
+def _group_sort_key(item: tuple[str, _TaxaGroup]) -> tuple[int, str]:
+    """Order groups by occurrence count descending, then name."""
+    name, entry = item
+    return -entry.count, name
+
+
 def _build_taxa_results(
-    groups: dict[str, _TaxaGroup],
-    image_counts: dict[str, int],
+    groups: dict[str, _TaxaGroup], limit: int | None = None
 ) -> list[TaxaResult]:
-    """Calculate per-group totals and sort by occurrence count descending."""
-    results: list[TaxaResult] = []
-    for name, entry in groups.items():
-        img_count = sum(image_counts.get(gid, 0) for gid in entry.gbif_ids)
-        ranks = " | ".join(sorted(entry.taxon_ranks)) if entry.taxon_ranks else ""
-        results.append(
-            TaxaResult(
-                name=name,
-                occurrence_count=entry.count,
-                image_count=img_count,
-                n_taxon_ids=len(entry.taxon_ids),
-                n_sci_names=len(entry.sci_names),
-                taxon_ranks=ranks,
-            )
+    """Calculate per-group totals and sort by occurrence count descending.
+
+    With a *limit* well below the number of groups, only the top *limit* are
+    selected (a heap, O(N log limit)) and turned into results.
+    """
+    if limit is not None and limit < len(groups) // 4:
+        ranked = heapq.nsmallest(limit, groups.items(), key=_group_sort_key)
+    else:
+        ranked = sorted(groups.items(), key=_group_sort_key)[:limit]
+    return [
+        TaxaResult(
+            name=name,
+            occurrence_count=entry.count,
+            image_count=entry.image_count,
+            n_taxon_ids=len(entry.taxon_ids or ()),
+            n_sci_names=len(entry.sci_names or ()),
+            taxon_ranks=" | ".join(sorted(entry.taxon_ranks)),
         )
-    results.sort(key=lambda r: (-r.occurrence_count, r.name))
-    return results
+        for name, entry in ranked
+    ]
 
 
 def _display_taxa_table(
@@ -237,12 +478,13 @@ def _output_json(
 ) -> None:
     """Write taxa results as JSON to stdout."""
     rows = [_result_to_dict(r, show_mismatched_names, show_images) for r in results]
-    json.dump(rows, sys.stdout, indent=2)
-    sys.stdout.write("\n")
+    # json.dump() with indent issues one write() per token; encode once instead.
+    sys.stdout.write(json.dumps(rows, indent=2) + "\n")
 
 
 def taxa(
     dwca_path: str,
+    *,
     group_by: GroupByColumn = typer.Option(
         GroupByColumn.scientificName,
         "--group-by",
@@ -258,7 +500,7 @@ def taxa(
         None,
         "--limit",
         "-n",
-        help="Limit the number of rows displayed.",
+        help=f"Limit the number of rows displayed (table output defaults to {TABLE_ROW_LIMIT}).",
     ),
     species_only: bool = typer.Option(
         False,
@@ -268,7 +510,7 @@ def taxa(
     image_counts_flag: bool = typer.Option(
         False,
         "--image-counts",
-        help="Include image counts per group (requires holding all gbifIDs in memory).",
+        help="Include image counts per group (holds an image count per gbifID in memory).",
     ),
     output_format: OutputFormat = typer.Option(
         OutputFormat.table,
@@ -276,6 +518,13 @@ def taxa(
         "-f",
         help="Output format: table (Rich), csv, or json.",
     ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Worker processes for aggregating occurrences (unquoted archives only).",
+    ),
 ) -> None:
     """Summarize taxa from a Darwin Core Archive, showing occurrence and image counts."""
     # When outputting data formats, redirect Rich status messages to stderr
@@ -307,14 +556,18 @@ def taxa(
             )
             raise typer.Exit(code=1)
 
+        image_counts: dict[str, int] | None = None
         if image_counts_flag and mm_table is not None:
             console.print(
-                "\n[yellow]Note:[/yellow] Image counting requires loading all occurrence IDs"
-                " into memory. For large archives\n(>1M occurrences), consider importing to a"
+                "\n[yellow]Note:[/yellow] Image counting keeps a count per multimedia gbifID"
+                " in memory. For large archives\n(>1M images), consider importing to a"
                 " database instead:\n"
                 "\n    dwca-tools convert archive.zip --db-url sqlite:///data.db"
                 "\n    dwca-tools aggregate populate-taxa-table sqlite:///data.db\n"
             )
+            image_counts = _aggregate_images(
+                zip_ref, mm_table.filename, mm_table.fields_enclosed_by
+            )
 
         groups = _aggregate_occurrences(
             zip_ref,
@@ -322,17 +575,19 @@ def taxa(
             group_col,
             show_mismatched_names,
             species_only,
-            collect_gbif_ids=image_counts_flag,
+            image_counts=image_counts,
+            quotechar=occ_table.fields_enclosed_by,
+            jobs=jobs,
         )
 
-        image_counts: dict[str, int] = {}
-        if image_counts_flag and mm_table is not None:
-            image_counts = _aggregate_images(zip_ref, mm_table.filename)
-
-    results = _build_taxa_results(groups, image_counts)
-    total_groups = len(results)
-    if limit is not None:
-        results = results[:limit]
+    total_groups = len(groups)
+    if output_format == OutputFormat.table and limit is None and total_groups > TABLE_ROW_LIMIT:
+        console.print(
+            f"[yellow]Showing the top {TABLE_ROW_LIMIT} groups;"
+            " use --limit or --format csv to see more.[/yellow]"
+        )
+        limit = TABLE_ROW_LIMIT
+    results = _build_taxa_results(groups, limit)
 
     if output_format == OutputFormat.csv:
         _output_csv(results, show_mismatched_names, show_images=image_counts_flag)
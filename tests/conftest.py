@@ -5,8 +5,12 @@ This file is automatically loaded by pytest and provides fixtures
 available to all test files.
 """
 
+from collections.abc import Iterator
+
 import pytest
 
+from dwca_tools.settings import get_convert_settings, get_gbif_settings
+
 # =============================================================================
 # Marker Configurations
 # =============================================================================
@@ -17,3 +21,24 @@ def pytest_configure(config: pytest.Config) -> None:
     config.addinivalue_line("markers", "slow: marks tests as slow running")
     config.addinivalue_line("markers", "integration: marks integration tests")
     config.addinivalue_line("markers", "unit: marks unit tests")
+    config.addinivalue_line("markers", "subprocess: launches a child Python process")
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def clear_settings_cache() -> Iterator[None]:
+    """Drop the cached settings before and after a test.
+
+    Settings read while a test's env vars are patched are cached process-wide;
+    clearing on teardown, even when the test fails, keeps them from leaking
+    into later tests.
+    """
+    get_convert_settings.cache_clear()
+    get_gbif_settings.cache_clear()
+    yield
+    get_convert_settings.cache_clear()
+    get_gbif_settings.cache_clear()
@@ -0,0 +1,111 @@
+"""Tests for the aggregate module."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from typer.testing import CliRunner
+
+from dwca_tools.cli import app
+from dwca_tools.db import create_engine_and_session
+
+runner = CliRunner()
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "test_dwca.zip"
+
+COLUMNS_OF_INTEREST = {
+    "occurrence": ["gbifID", "scientificName", "family", "taxonID"],
+    "multimedia": ["gbifID", "identifier"],
+}
+
+
+@pytest.fixture
+def converted_db(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, clear_settings_cache: None
+) -> str:
+    """Convert the fixture archive with taxon columns loaded and return its URL."""
+    monkeypatch.setenv("DWCA_COLUMNS_OF_INTEREST", json.dumps(COLUMNS_OF_INTEREST))
+    db_url = f"sqlite:///{tmp_path / 'test.db'}"
+    result = runner.invoke(app, ["convert", "convert", str(FIXTURE_PATH), "--db-url", db_url])
+    assert result.exit_code == 0, result.output
+    return db_url
+
+
+@pytest.mark.integration
+class TestPopulateTaxaTable:
+    """Tests for the populate-taxa-table command."""
+
+    def test_counts_per_taxon(self, converted_db: str) -> None:
+        """Occurrence and multimedia counts are computed independently per taxonID."""
+        result = runner.invoke(app, ["aggregate", "populate-taxa-table", converted_db])
+        assert result.exit_code == 0, result.output
+
+        engine, session = create_engine_and_session(converted_db)
+        taxa = sa.Table("taxa", sa.MetaData(), autoload_with=engine)
+        rows = {
+            row.taxonID: row
+            for row in session.execute(sa.select(taxa).order_by(taxa.c.taxonID)).fetchall()
+        }
+        session.close()
+
+        assert len(rows) == 5
+        # Danaus plexippus: 5 occurrences, 3 with images (gbifIDs 1001, 1005, 1009)
+        assert rows["1"].scientificName == "Danaus plexippus"
+        assert rows["1"].occurrences_count == 5
+        assert rows["1"].multimedia_count == 3
+        # Papilio polyxenes: 1 occurrence (gbifID 1019), no images
+        assert rows["5"].occurrences_count == 1
+        assert rows["5"].multimedia_count == 0
+        assert sum(r.multimedia_count for r in rows.values()) == 10
+
+    def test_rerun_refreshes_counts(self, converted_db: str) -> None:
+        """Running the command again replaces the taxa rows with current counts."""
+        result = runner.invoke(app, ["aggregate", "populate-taxa-table", converted_db])
+        assert result.exit_code == 0, result.output
+
+        engine, session = create_engine_and_session(converted_db)
+        with engine.begin() as conn:
+            conn.execute(
+                sa.text(
+                    'INSERT INTO occurrence ("gbifID", "scientificName", "taxonID")'
+                    " VALUES ('9999', 'Papilio polyxenes', '5')"
+                )
+            )
+        session.close()
+
+        result = runner.invoke(app, ["aggregate", "populate-taxa-table", converted_db])
+        assert result.exit_code == 0, result.output
+
+        engine, session = create_engine_and_session(converted_db)
+        taxa = sa.Table("taxa", sa.MetaData(), autoload_with=engine)
+        count = session.execute(sa.select(sa.func.count()).select_from(taxa)).scalar_one()
+        polyxenes = session.execute(
+            sa.select(taxa.c.occurrences_count).where(taxa.c.taxonID == "5")
+        ).scalar_one()
+        session.close()
+        assert count == 5
+        assert polyxenes == 2
+
+    def test_join_columns_indexed(self, converted_db: str) -> None:
+        """The aggregate creates indexes on its grouping and join columns."""
+        result = runner.invoke(app, ["aggregate", "populate-taxa-table", converted_db])
+        assert result.exit_code == 0, result.output
+
+        engine, session = create_engine_and_session(converted_db)
+        inspector = sa.inspect(engine)
+        occ_indexed = {c for ix in inspector.get_indexes("occurrence") for c in ix["column_names"]}
+        mm_indexed = {c for ix in inspector.get_indexes("multimedia") for c in ix["column_names"]}
+        session.close()
+        assert "taxonID" in occ_indexed
+        assert "gbifID" in mm_indexed
+
+    def test_batch_size_deprecated(self, converted_db: str) -> None:
+        """The old --batch-size option is still accepted, with a warning."""
+        result = runner.invoke(
+            app, ["aggregate", "populate-taxa-table", converted_db, "--batch-size", "500"]
+        )
+        assert result.exit_code == 0, result.output
+        assert "deprecated" in result.output
@@ -6,10 +6,14 @@ These tests verify the command-line interface logic.
 
 from __future__ import annotations
 
+import subprocess
+import sys
+
+import pytest
 from typer.testing import CliRunner
 
 from dwca_tools import __version__
-from dwca_tools.cli import app
+from dwca_tools.cli import app, load_subcommand
 
 runner = CliRunner()
 
@@ -28,3 +32,35 @@ class TestCLI:
         result = runner.invoke(app, ["--help"])
         assert result.exit_code == 0
         assert "Darwin Core Archive" in result.stdout or "DwC-A" in result.stdout
+
+    def test_help_lists_subcommands(self) -> None:
+        """All lazily registered subcommands appear in the help output."""
+        result = runner.invoke(app, ["--help"])
+        assert result.exit_code == 0
+        for name in ("summarize", "convert", "aggregate", "download"):
+            assert name in result.stdout
+
+    @pytest.mark.subprocess
+    def test_import_does_not_load_subcommand_modules(self) -> None:
+        """Importing the CLI defers heavy subcommand dependencies."""
+        code = (
+            "import sys; import dwca_tools.cli; "
+            "print(any(m in sys.modules for m in ('sqlalchemy', 'dwca_tools.convert')))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert out.stdout.strip() == "False"
+
+    def test_help_does_not_load_subcommand_modules(self) -> None:
+        """Top-level help lists subcommands without building their groups."""
+        load_subcommand.cache_clear()
+        result = runner.invoke(app, ["--help"])
+        assert result.exit_code == 0
+        assert "Convert DwC-A files to SQL databases" in result.stdout
+        assert load_subcommand.cache_info().currsize == 0
+
+    def test_subcommand_group_is_built_once(self) -> None:
+        """Resolving a subcommand repeatedly reuses the same click group."""
+        assert load_subcommand("download") is load_subcommand("download")
+        assert load_subcommand("download").name == "download"
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import os
 import re
+import zipfile
 from pathlib import Path
 
 import pytest
@@ -10,6 +12,15 @@ import sqlalchemy as sa
 from typer.testing import CliRunner
 
 from dwca_tools.cli import app
+from dwca_tools.convert import (
+    ROW_SAMPLE_SIZE,
+    _sqlite_insert_table,
+    create_indexes,
+    estimate_row_count,
+    read_chunks,
+    read_headers,
+    read_line_chunks,
+)
 from dwca_tools.db import create_engine_and_session
 from dwca_tools.settings import get_convert_settings
 
@@ -17,6 +28,91 @@ runner = CliRunner()
 
 FIXTURE_PATH = Path(__file__).parent / "fixtures" / "test_dwca.zip"
 
+POSTGRES_URL = os.environ.get("DWCA_TEST_POSTGRES_URL")
+
+META_XML = """<?xml version="1.0" encoding="utf-8"?>
+<archive xmlns="http://rs.tdwg.org/dwc/text/">
+  <core fieldsTerminatedBy="\\t" fieldsEnclosedBy="{enclosed_by}" ignoreHeaderLines="1">
+    <files><location>occurrence.txt</location></files>
+    <field index="0" term="http://rs.gbif.org/terms/1.0/gbifID"/>
+    <field index="1" term="http://rs.tdwg.org/dwc/terms/scientificName"/>
+    <field index="2" term="http://rs.tdwg.org/dwc/terms/eventDate"/>
+  </core>
+</archive>
+"""
+
+
+def _write_archive(path: Path, enclosed_by: str, lines: list[str]) -> Path:
+    """Write a one-table archive whose meta.xml declares *enclosed_by* quoting."""
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("meta.xml", META_XML.format(enclosed_by=enclosed_by))
+        zf.writestr("occurrence.txt", "gbifID\tscientificName\teventDate\n" + "".join(lines))
+    return path
+
+
+class TestReadChunks:
+    """Tests for chunked reading of archive members."""
+
+    def test_chunk_sizes(self) -> None:
+        """Rows are split into chunks of at most chunk_size, header excluded."""
+        with zipfile.ZipFile(FIXTURE_PATH) as zf:
+            chunks = list(read_chunks(zf, "occurrence.txt", 7))
+        assert [len(chunk) for _headers, chunk in chunks] == [7, 7, 6]
+        headers, first = chunks[0]
+        assert headers[0] == "gbifID"
+        assert first[0][0] == "1001"
+
+    def test_line_chunks_match_parsed_chunks(self) -> None:
+        """read_line_chunks yields the same rows as read_chunks, as raw bytes."""
+        with zipfile.ZipFile(FIXTURE_PATH) as zf:
+            parsed = [
+                row for _headers, chunk in read_chunks(zf, "occurrence.txt", 7) for row in chunk
+            ]
+            line_chunks = list(read_line_chunks(zf, "occurrence.txt", 7))
+        assert [len(chunk) for chunk in line_chunks] == [7, 7, 6]
+        raw = [line.rstrip(b"\n").decode().split("\t") for chunk in line_chunks for line in chunk]
+        assert raw == parsed
+
+    def test_unquoted_fields_kept_literally(self, tmp_path: Path) -> None:
+        """Without fieldsEnclosedBy, a leading quote is part of the value."""
+        archive = _write_archive(tmp_path / "a.zip", "", ['1\t"Smith" collection\t2024\n'])
+        with zipfile.ZipFile(archive) as zf:
+            (_headers, chunk), *_ = read_chunks(zf, "occurrence.txt", 10)
+        assert chunk == [["1", '"Smith" collection', "2024"]]
+
+    def test_quoted_fields_parsed(self, tmp_path: Path) -> None:
+        """With a quote character, quoted fields may contain tabs."""
+        archive = _write_archive(tmp_path / "a.zip", "&quot;", ['1\t"a\tb"\t2024\n'])
+        with zipfile.ZipFile(archive) as zf:
+            (_headers, chunk), *_ = read_chunks(zf, "occurrence.txt", 10, quotechar='"')
+        assert chunk == [["1", "a\tb", "2024"]]
+
+    def test_read_headers_matches_chunks(self) -> None:
+        """read_headers returns the same header row that read_chunks yields."""
+        with zipfile.ZipFile(FIXTURE_PATH) as zf:
+            headers, _chunk = next(read_chunks(zf, "occurrence.txt", 7))
+            assert read_headers(zf, "occurrence.txt") == headers
+
+
+class TestEstimateRowCount:
+    """Tests for sampled row estimation."""
+
+    def test_small_member_counted_exactly(self) -> None:
+        """Members smaller than the sample are counted exactly (header included)."""
+        with zipfile.ZipFile(FIXTURE_PATH) as zf:
+            assert estimate_row_count(zf, "occurrence.txt") == 21
+
+    def test_large_member_extrapolated(self, tmp_path: Path) -> None:
+        """Larger members are extrapolated from the sampled prefix."""
+        line = "x" * 99 + "\n"
+        n_lines = 4 * ROW_SAMPLE_SIZE // len(line)
+        zip_path = tmp_path / "big.zip"
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("big.txt", line * n_lines)
+        with zipfile.ZipFile(zip_path) as zf:
+            estimate = estimate_row_count(zf, "big.txt")
+        assert abs(estimate - n_lines) <= n_lines // 100
+
 
 class TestConvertCLI:
     """Tests for convert CLI command."""
@@ -30,9 +126,9 @@ class TestConvertCLI:
         assert "num-threads" in plain
 
     @pytest.mark.integration
+    @pytest.mark.usefixtures("clear_settings_cache")
     def test_convert_sqlite(self, tmp_path: Path) -> None:
         """Convert a test archive to SQLite and verify row counts."""
-        get_convert_settings.cache_clear()
         db_path = tmp_path / "test.db"
         db_url = f"sqlite:///{db_path}"
 
@@ -50,6 +146,8 @@ class TestConvertCLI:
         )
         assert result.exit_code == 0, result.output
         assert "Conversion completed successfully" in result.output
+        assert "Inserted 20 rows into occurrence" in result.output
+        assert "Inserted 10 rows into multimedia" in result.output
 
         engine, session = create_engine_and_session(db_url)
         inspector = sa.inspect(engine)
@@ -69,23 +167,160 @@ class TestConvertCLI:
         session.close()
 
 
+class TestSqliteInsert:
+    """Tests for the SQLite insert path."""
+
+    def test_rejects_unsafe_header_columns(self, tmp_path: Path) -> None:
+        """Column names from the data file's header are validated before use in SQL."""
+        archive = tmp_path / "a.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("occurrence.txt", 'gbifID\tname") --\n1\tx\n')
+        engine, session = create_engine_and_session(f"sqlite:///{tmp_path / 'a.db'}")
+        session.close()
+        with (
+            zipfile.ZipFile(archive) as zf,
+            pytest.raises(ValueError, match="Invalid SQL identifier"),
+        ):
+            _sqlite_insert_table(
+                engine,
+                zf,
+                "occurrence",
+                "occurrence.txt",
+                columns=None,
+                quotechar="",
+                chunk_size=10,
+            )
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(POSTGRES_URL is None, reason="DWCA_TEST_POSTGRES_URL not set")
+@pytest.mark.usefixtures("clear_settings_cache")
+class TestConvertPostgres:
+    """Tests for the PostgreSQL COPY path (needs a scratch database)."""
+
+    @pytest.fixture(autouse=True)
+    def _empty_database(self) -> None:
+        engine = sa.create_engine(str(POSTGRES_URL))
+        metadata = sa.MetaData()
+        metadata.reflect(engine)
+        metadata.drop_all(engine)
+        engine.dispose()
+
+    def _convert_and_count(self) -> dict[str, int]:
+        result = runner.invoke(
+            app, ["convert", "convert", str(FIXTURE_PATH), "--db-url", str(POSTGRES_URL)]
+        )
+        assert result.exit_code == 0, result.output
+        engine = sa.create_engine(str(POSTGRES_URL))
+        with engine.connect() as conn:
+            counts = {
+                name: conn.execute(sa.text(f"SELECT count(*) FROM {name}")).scalar_one()
+                for name in ("occurrence", "multimedia")
+            }
+            counts["taxon_ids"] = conn.execute(
+                sa.text('SELECT count("taxonID") FROM occurrence')
+            ).scalar_one()
+        engine.dispose()
+        return counts
+
+    def test_copy_column_subset(self) -> None:
+        """Configured columns are loaded chunk by chunk."""
+        counts = self._convert_and_count()
+        assert counts == {"occurrence": 20, "multimedia": 10, "taxon_ids": 0}
+
+    def test_copy_whole_member(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Without a column filter, members are streamed straight into COPY."""
+        monkeypatch.setenv("DWCA_COLUMNS_OF_INTEREST", "{}")
+        counts = self._convert_and_count()
+        assert counts == {"occurrence": 20, "multimedia": 10, "taxon_ids": 20}
+
+    @pytest.mark.parametrize("whole_member", [False, True])
+    @pytest.mark.parametrize(
+        ("enclosed_by", "line", "expected"),
+        [
+            ("", '1\t"Smith" collection\t2024\n', '"Smith" collection'),
+            ("&quot;", '1\t"a\tb"\t2024\n', "a\tb"),
+        ],
+    )
+    def test_quoting_follows_meta_xml(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        *,
+        whole_member: bool,
+        enclosed_by: str,
+        line: str,
+        expected: str,
+    ) -> None:
+        """Both COPY paths honour fieldsEnclosedBy from meta.xml."""
+        if whole_member:
+            monkeypatch.setenv("DWCA_COLUMNS_OF_INTEREST", "{}")
+        archive = _write_archive(tmp_path / "a.zip", enclosed_by, [line])
+        result = runner.invoke(
+            app, ["convert", "convert", str(archive), "--db-url", str(POSTGRES_URL)]
+        )
+        assert result.exit_code == 0, result.output
+        engine = sa.create_engine(str(POSTGRES_URL))
+        with engine.connect() as conn:
+            value = conn.execute(sa.text('SELECT "scientificName" FROM occurrence')).scalar_one()
+        engine.dispose()
+        assert value == expected
+
+    def test_tables_logged_after_load(self) -> None:
+        """Tables loaded UNLOGGED are switched back to LOGGED once populated."""
+        self._convert_and_count()
+        engine = sa.create_engine(str(POSTGRES_URL))
+        with engine.connect() as conn:
+            persistence = dict(
+                conn.execute(
+                    sa.text(
+                        "SELECT relname, relpersistence FROM pg_class"
+                        " WHERE relname IN ('occurrence', 'multimedia')"
+                    )
+                ).all()
+            )
+        engine.dispose()
+        assert persistence == {"occurrence": "p", "multimedia": "p"}
+
+    def test_indexes_built_in_parallel(self) -> None:
+        """All configured indexes exist after the parallel PostgreSQL build."""
+        self._convert_and_count()
+        engine = sa.create_engine(str(POSTGRES_URL))
+        indexed = {
+            c for ix in sa.inspect(engine).get_indexes("occurrence") for c in ix["column_names"]
+        }
+        engine.dispose()
+        assert {"gbifID", "scientificName", "eventDate"} <= indexed
+
+    def test_serial_index_build_sets_maintenance_work_mem(self) -> None:
+        """A single-connection index build still raises maintenance_work_mem."""
+        engine = sa.create_engine(str(POSTGRES_URL))
+        with engine.begin() as conn:
+            conn.execute(sa.text('CREATE TABLE occurrence ("gbifID" text)'))
+        statements: list[str] = []
+        sa.event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        create_indexes(engine, "occurrence", ["gbifID"], maintenance_work_mem="64MB")
+        engine.dispose()
+        set_config = next(i for i, sql in enumerate(statements) if "maintenance_work_mem" in sql)
+        create_index = next(i for i, sql in enumerate(statements) if "CREATE INDEX" in sql)
+        assert set_config < create_index
+
+
+@pytest.mark.usefixtures("clear_settings_cache")
 class TestConvertSettings:
     """Tests for ConvertSettings."""
 
     def test_defaults(self) -> None:
         """Default settings have expected values."""
-        get_convert_settings.cache_clear()
         settings = get_convert_settings()
         assert settings.chunk_size == 500
         assert settings.num_threads == 4
         assert "occurrence" in settings.columns_of_interest
         assert "occurrence" in settings.indexes
+        assert settings.maintenance_work_mem is None
 
     def test_env_override(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Settings can be overridden via env vars."""
-        get_convert_settings.cache_clear()
         monkeypatch.setenv("DWCA_CHUNK_SIZE", "100")
-        get_convert_settings.cache_clear()
         settings = get_convert_settings()
         assert settings.chunk_size == 100
-        get_convert_settings.cache_clear()
@@ -0,0 +1,77 @@
+"""Tests for the db module."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from dwca_tools.db import (
+    create_engine_and_session,
+    create_table,
+    summarize_sql_tables,
+    validate_sql_identifier,
+)
+from dwca_tools.schemas import ColumnDefinition
+
+
+class TestCreateEngineAndSession:
+    """Tests for engine/session creation."""
+
+    def test_sqlite_pragmas_applied(self, tmp_path: Path) -> None:
+        """SQLite connections use WAL with relaxed fsync."""
+        engine, session = create_engine_and_session(f"sqlite:///{tmp_path / 'x.db'}")
+        with engine.connect() as conn:
+            assert conn.execute(sa.text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(sa.text("PRAGMA synchronous")).scalar() == 1
+        session.close()
+
+
+class TestCreateTable:
+    """Tests for table construction from column definitions."""
+
+    def test_prefixes_rendered(self) -> None:
+        """Prefixes such as UNLOGGED end up in the CREATE TABLE statement."""
+        columns = [ColumnDefinition(index="0", name="gbifID")]
+        table = create_table(sa.MetaData(), "occurrence", columns, prefixes=["UNLOGGED"])
+        ddl = str(CreateTable(table).compile(dialect=postgresql.dialect()))
+        assert ddl.strip().startswith("CREATE UNLOGGED TABLE occurrence")
+
+
+class TestSummarizeSqlTables:
+    """Tests for the SQL table summary."""
+
+    def test_rows_and_columns_listed(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Each table is listed with its row count and columns."""
+        engine, session = create_engine_and_session(f"sqlite:///{tmp_path / 'x.db'}")
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE occurrence (id INTEGER, gbifID VARCHAR)")
+            conn.exec_driver_sql("INSERT INTO occurrence VALUES (1, '1001'), (2, '1002')")
+            conn.exec_driver_sql("CREATE TABLE multimedia (id INTEGER)")
+        summarize_sql_tables(engine, session)
+        session.close()
+        out = capsys.readouterr().out
+        assert "Summary for table multimedia" in out
+        assert "Rows: 2" in out
+        assert "Rows: 0" in out
+        assert "gbifID (VARCHAR)" in out
+
+
+class TestValidateSqlIdentifier:
+    """Tests for SQL identifier validation."""
+
+    @pytest.mark.parametrize("name", ["gbifID", "_private", "col_2", "select"])
+    def test_accepts_plain_identifiers(self, name: str) -> None:
+        """Letters, digits and underscores not starting with a digit are accepted."""
+        assert validate_sql_identifier(name) == name
+
+    @pytest.mark.parametrize("name", ["", "2col", "my-col", 'a"b', "taxonID\n", "nämn"])
+    def test_rejects_unsafe_names(self, name: str) -> None:
+        """Anything outside [A-Za-z_][A-Za-z0-9_]* raises ValueError."""
+        with pytest.raises(ValueError, match="Invalid SQL identifier"):
+            validate_sql_identifier(name)
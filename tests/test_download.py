@@ -4,21 +4,29 @@ from __future__ import annotations
 
 import json
 import re
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
+import typer
 from typer.testing import CliRunner
 
 from dwca_tools.cli import app
 from dwca_tools.download import (
+    DEFAULT_PARTS,
     build_predicate,
     build_request_body,
+    get_download_status,
+    get_session,
     load_extra_predicate,
     load_values_from_file,
+    poll_until_complete,
     predicate_and,
     predicate_equals,
     predicate_in,
+    stream_download_file,
 )
 from dwca_tools.settings import GbifSettings, get_gbif_settings
 
@@ -139,6 +147,11 @@ class TestLoadValuesFromFile:
         f.write_text("  111  \n  222  \n")
         assert load_values_from_file(f) == ["111", "222"]
 
+    def test_drops_duplicates_keeping_order(self, tmp_path: Path) -> None:
+        f = tmp_path / "keys.txt"
+        f.write_text("222\n111\n222\n 111 \n333\n")
+        assert load_values_from_file(f) == ["222", "111", "333"]
+
     def test_empty_file(self, tmp_path: Path) -> None:
         f = tmp_path / "keys.txt"
         f.write_text("")
@@ -173,16 +186,291 @@ class TestBuildRequestBody:
         assert body["sendNotification"] is True
 
 
+# ---------------------------------------------------------------------------
+# HTTP session
+# ---------------------------------------------------------------------------
+
+
+class TestGetSession:
+    """Tests for the shared GBIF HTTP session."""
+
+    def test_session_is_cached(self) -> None:
+        assert get_session() is get_session()
+
+    def test_https_adapter_retries_gateway_errors(self) -> None:
+        adapter = get_session().get_adapter("https://api.gbif.org/v1/")
+        assert adapter.max_retries.total == 5
+        assert 503 in adapter.max_retries.status_forcelist
+
+    @pytest.mark.parametrize(("parts", "pool_maxsize"), [(1, DEFAULT_PARTS), (16, 16)])
+    def test_pool_holds_a_connection_per_part(self, parts: int, pool_maxsize: int) -> None:
+        """Ranged-download workers never overflow the connection pool."""
+        adapter = get_session(parts).get_adapter("https://api.gbif.org/v1/")
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == pool_maxsize
+
+
+# ---------------------------------------------------------------------------
+# Status
+# ---------------------------------------------------------------------------
+
+
+class TestGetDownloadStatus:
+    """Tests for conditional status requests."""
+
+    def test_not_modified_returns_cached_status(self) -> None:
+        first = MagicMock(status_code=200, headers={"etag": '"abc"'})
+        first.json.return_value = {"status": "RUNNING"}
+        second = MagicMock(status_code=304, headers={})
+        session = MagicMock()
+        session.get.side_effect = [first, second]
+
+        with patch("dwca_tools.download.get_session", return_value=session):
+            assert get_download_status("etag-key") == {"status": "RUNNING"}
+            assert get_download_status("etag-key") == {"status": "RUNNING"}
+
+        assert session.get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"abc"'}
+        second.json.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# Polling
+# ---------------------------------------------------------------------------
+
+
+@patch("dwca_tools.download.time.sleep")
+@patch("dwca_tools.download.get_download_status")
+class TestPollUntilComplete:
+    """Tests for the adaptive GBIF status polling loop."""
+
+    def test_returns_info_on_success(self, mock_status: MagicMock, mock_sleep: MagicMock) -> None:
+        mock_status.side_effect = [{"status": "RUNNING"}, {"status": "SUCCEEDED", "doi": "x"}]
+        info = poll_until_complete("key", poll_interval=60, max_polls=5)
+        assert info["doi"] == "x"
+        assert mock_sleep.call_count == 1
+
+    def test_interval_grows_to_cap(self, mock_status: MagicMock, mock_sleep: MagicMock) -> None:
+        mock_status.return_value = {"status": "RUNNING"}
+        with pytest.raises(typer.Exit):
+            poll_until_complete("key", poll_interval=20, max_polls=8)
+        waits = [c.args[0] for c in mock_sleep.call_args_list]
+        assert len(waits) == 7
+        assert waits[0] <= 5 * 1.2
+        assert all(w <= 20 * 1.2 for w in waits)
+        assert waits[-1] >= 20 * 0.8
+
+    def test_transient_errors_keep_polling(
+        self, mock_status: MagicMock, mock_sleep: MagicMock
+    ) -> None:
+        mock_status.side_effect = [requests.ConnectionError("boom"), {"status": "SUCCEEDED"}]
+        info = poll_until_complete("key", poll_interval=60, max_polls=5)
+        assert info["status"] == "SUCCEEDED"
+
+    def test_exhausted_gateway_retries_keep_polling(
+        self, mock_status: MagicMock, mock_sleep: MagicMock
+    ) -> None:
+        """The session's own 5xx retries giving up backs off like any transient error."""
+        mock_status.side_effect = [
+            requests.exceptions.RetryError("too many 503 error responses"),
+            {"status": "SUCCEEDED"},
+        ]
+        info = poll_until_complete("key", poll_interval=60, max_polls=5)
+        assert info["status"] == "SUCCEEDED"
+        assert mock_sleep.call_count == 1
+
+    def test_client_errors_propagate(self, mock_status: MagicMock, mock_sleep: MagicMock) -> None:
+        resp = requests.Response()
+        resp.status_code = 404
+        mock_status.side_effect = requests.HTTPError(response=resp)
+        with pytest.raises(requests.HTTPError):
+            poll_until_complete("key", max_polls=5)
+        mock_sleep.assert_not_called()
+
+    def test_failed_download_exits(self, mock_status: MagicMock, mock_sleep: MagicMock) -> None:
+        mock_status.return_value = {"status": "KILLED", "eraseReason": "quota"}
+        with pytest.raises(typer.Exit):
+            poll_until_complete("key", max_polls=5)
+
+
+# ---------------------------------------------------------------------------
+# Archive download
+# ---------------------------------------------------------------------------
+
+
+class _FakeResponse:
+    """Minimal stand-in for a streamed ``requests.Response``."""
+
+    def __init__(self, body: bytes, status_code: int = 200, headers: dict | None = None) -> None:
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.url = "https://download.example.org/archive.zip"
+
+    def __enter__(self) -> _FakeResponse:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        pass
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_content(self, chunk_size: int) -> list[bytes]:
+        return [self.body[i : i + chunk_size] for i in range(0, len(self.body), chunk_size)]
+
+
+class _FakeSession:
+    """Serves *payload* and honours ``Range`` headers when *ranged* is set."""
+
+    def __init__(self, payload: bytes, ranged: bool = True) -> None:
+        self.payload = payload
+        self.ranged = ranged
+        self.ranges: list[str] = []
+
+    def head(self, url: str, **kwargs: object) -> _FakeResponse:
+        headers = {"content-length": str(len(self.payload)), "etag": '"v1"'}
+        if self.ranged:
+            headers["accept-ranges"] = "bytes"
+        return _FakeResponse(b"", headers=headers)
+
+    def get(self, url: str, headers: dict | None = None, **kwargs: object) -> _FakeResponse:
+        if headers and "Range" in headers:
+            self.ranges.append(headers["Range"])
+            start, end = (int(x) for x in headers["Range"].split("=")[1].split("-"))
+            return _FakeResponse(self.payload[start : end + 1], status_code=206)
+        return _FakeResponse(self.payload, headers={"content-length": str(len(self.payload))})
+
+
+class TestStreamDownloadFile:
+    """Tests for serial and ranged archive downloads."""
+
+    payload = bytes(range(256)) * 40
+
+    def test_parallel_ranges_reassemble_file(self, tmp_path: Path) -> None:
+        session = _FakeSession(self.payload)
+        out = tmp_path / "out.zip"
+        with patch("dwca_tools.download.get_session", return_value=session):
+            stream_download_file("key", out, parts=4, part_size=1000)
+        assert out.read_bytes() == self.payload
+        assert len(session.ranges) == 11
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["out.zip"]
+
+    def test_serial_fallback_without_range_support(self, tmp_path: Path) -> None:
+        session = _FakeSession(self.payload, ranged=False)
+        out = tmp_path / "out.zip"
+        with patch("dwca_tools.download.get_session", return_value=session):
+            stream_download_file("key", out, parts=4, part_size=1000)
+        assert out.read_bytes() == self.payload
+        assert session.ranges == []
+
+    def test_failed_serial_download_leaves_no_file(self, tmp_path: Path) -> None:
+        session = _FakeSession(self.payload, ranged=False)
+        out = tmp_path / "out.zip"
+        with (
+            patch("dwca_tools.download.get_session", return_value=session),
+            patch.object(_FakeResponse, "iter_content", side_effect=requests.ConnectionError),
+            pytest.raises(requests.ConnectionError),
+        ):
+            stream_download_file("key", out, parts=4, part_size=1000)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_resume_skips_completed_parts(self, tmp_path: Path) -> None:
+        out = tmp_path / "out.zip"
+        partial = bytearray(len(self.payload))
+        partial[:2000] = self.payload[:2000]
+        (tmp_path / "out.zip.part").write_bytes(bytes(partial))
+        ckpt = {"size": len(self.payload), "etag": '"v1"', "part_size": 1000, "done": [0, 1]}
+        (tmp_path / "out.zip.part.ckpt.json").write_text(json.dumps(ckpt))
+
+        session = _FakeSession(self.payload)
+        with patch("dwca_tools.download.get_session", return_value=session):
+            stream_download_file("key", out, parts=4, part_size=1000)
+        assert out.read_bytes() == self.payload
+        assert "bytes=0-999" not in session.ranges
+        assert len(session.ranges) == 9
+
+    @pytest.mark.parametrize(
+        "ckpt",
+        [
+            {"part_size": 1000, "done": [0, 1]},
+            {"part_size": 4000, "done": [2, 3]},
+        ],
+    )
+    def test_resume_with_other_part_size_starts_over(
+        self, tmp_path: Path, ckpt: dict[str, object]
+    ) -> None:
+        """Parts checkpointed under another --part-size, or out of range, are refetched."""
+        out = tmp_path / "out.zip"
+        partial = bytearray(len(self.payload))
+        partial[:2000] = self.payload[:2000]
+        (tmp_path / "out.zip.part").write_bytes(bytes(partial))
+        ckpt = {"size": len(self.payload), "etag": '"v1"', **ckpt}
+        (tmp_path / "out.zip.part.ckpt.json").write_text(json.dumps(ckpt))
+
+        session = _FakeSession(self.payload)
+        with patch("dwca_tools.download.get_session", return_value=session):
+            stream_download_file("key", out, parts=4, part_size=4000)
+        assert out.read_bytes() == self.payload
+        assert len(session.ranges) == 3
+
+    def test_failed_part_checkpoints_and_resumes(self, tmp_path: Path) -> None:
+        """A failing part cancels queued parts, checkpoints finished ones, and resumes."""
+        out = tmp_path / "out.zip"
+        session = _FakeSession(self.payload)
+        fetch_range = session.get
+
+        def flaky_get(url: str, headers: dict | None = None, **kwargs: object) -> _FakeResponse:
+            if headers and headers.get("Range") == "bytes=0-999":
+                session.ranges.append(headers["Range"])
+                raise requests.ConnectionError
+            time.sleep(0.05)
+            return fetch_range(url, headers=headers, **kwargs)
+
+        with (
+            patch("dwca_tools.download.get_session", return_value=session),
+            patch.object(session, "get", side_effect=flaky_get),
+            pytest.raises(requests.ConnectionError),
+        ):
+            stream_download_file("key", out, parts=2, part_size=1000)
+        fetched = [r for r in session.ranges if r != "bytes=0-999"]
+        assert len(session.ranges) < 11
+        ckpt = json.loads((tmp_path / "out.zip.part.ckpt.json").read_text())
+        assert len(ckpt["done"]) == len(fetched)
+        assert 0 not in ckpt["done"]
+
+        resumed = _FakeSession(self.payload)
+        with patch("dwca_tools.download.get_session", return_value=resumed):
+            stream_download_file("key", out, parts=2, part_size=1000)
+        assert out.read_bytes() == self.payload
+        assert "bytes=0-999" in resumed.ranges
+        assert len(resumed.ranges) == 11 - len(fetched)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["out.zip"]
+
+    def test_fetch_rejects_zero_part_size(self) -> None:
+        """--part-size must be at least 1."""
+        result = runner.invoke(app, ["download", "fetch", "key", "--part-size", "0"])
+        assert result.exit_code != 0
+
+    def test_sparse_fallback_without_fallocate(self, tmp_path: Path) -> None:
+        session = _FakeSession(self.payload)
+        out = tmp_path / "out.zip"
+        with (
+            patch("dwca_tools.download.get_session", return_value=session),
+            patch("dwca_tools.download.os.posix_fallocate", side_effect=OSError, create=True),
+        ):
+            stream_download_file("key", out, parts=4, part_size=1000)
+        assert out.read_bytes() == self.payload
+
+
 # ---------------------------------------------------------------------------
 # Settings
 # ---------------------------------------------------------------------------
 
 
+@pytest.mark.usefixtures("clear_settings_cache")
 class TestGbifSettings:
     """Tests for GbifSettings via pydantic-settings."""
 
     def test_defaults_are_empty(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        get_gbif_settings.cache_clear()
         monkeypatch.delenv("GBIF_USERNAME", raising=False)
         monkeypatch.delenv("GBIF_PASSWORD", raising=False)
         monkeypatch.delenv("GBIF_EMAIL", raising=False)
@@ -192,7 +480,6 @@ class TestGbifSettings:
         assert settings.email == ""
 
     def test_env_vars_loaded(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        get_gbif_settings.cache_clear()
         monkeypatch.setenv("GBIF_USERNAME", "testuser")
         monkeypatch.setenv("GBIF_PASSWORD", "testpass")
         monkeypatch.setenv("GBIF_EMAIL", "test@example.com")
@@ -202,12 +489,10 @@ class TestGbifSettings:
         assert settings.email == "test@example.com"
 
     def test_get_gbif_settings_caches(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        get_gbif_settings.cache_clear()
         monkeypatch.setenv("GBIF_USERNAME", "cached")
         s1 = get_gbif_settings()
         s2 = get_gbif_settings()
         assert s1 is s2
-        get_gbif_settings.cache_clear()
 
 
 # ---------------------------------------------------------------------------
@@ -215,6 +500,7 @@ class TestGbifSettings:
 # ---------------------------------------------------------------------------
 
 
+@pytest.mark.usefixtures("clear_settings_cache")
 class TestDownloadCLI:
     """Smoke tests for download CLI commands."""
 
@@ -232,20 +518,34 @@ class TestDownloadCLI:
     def test_status_help(self) -> None:
         result = runner.invoke(app, ["download", "status", "--help"])
         assert result.exit_code == 0
-        assert "download-key" in result.stdout.lower() or "DOWNLOAD_KEY" in result.stdout
+        # Typer renders the argument as DOWNLOAD_KEY, download-key or download_key
+        # depending on its version.
+        assert "download-key" in result.stdout.lower().replace("_", "-")
 
     def test_fetch_help(self) -> None:
         result = runner.invoke(app, ["download", "fetch", "--help"])
         assert result.exit_code == 0
-        assert "download-key" in result.stdout.lower() or "DOWNLOAD_KEY" in result.stdout
+        # Typer renders the argument as DOWNLOAD_KEY, download-key or download_key
+        # depending on its version.
+        assert "download-key" in result.stdout.lower().replace("_", "-")
+
+    @pytest.mark.parametrize("command", ["status", "fetch"])
+    def test_network_failure_prints_error(self, command: str) -> None:
+        """Connection and exhausted-retry failures exit cleanly instead of a traceback."""
+        with patch(
+            "dwca_tools.download.get_download_status",
+            side_effect=requests.exceptions.RetryError("too many 503 error responses"),
+        ):
+            result = runner.invoke(app, ["download", command, "key"])
+        assert result.exit_code == 1
+        assert isinstance(result.exception, SystemExit)
+        assert "too many 503 error responses" in result.stdout
 
     def test_request_no_taxa_exits_with_error(self) -> None:
-        get_gbif_settings.cache_clear()
         result = runner.invoke(app, ["download", "request"])
         assert result.exit_code != 0
 
     def test_request_both_file_and_keys_errors(self, tmp_path: Path) -> None:
-        get_gbif_settings.cache_clear()
         f = tmp_path / "keys.txt"
         f.write_text("123\n")
         result = runner.invoke(app, ["download", "request", str(f), "--taxon-keys", "456"])
@@ -256,7 +556,6 @@ class TestDownloadCLI:
     def test_request_no_wait_flow(
         self, mock_submit: MagicMock, monkeypatch: pytest.MonkeyPatch
     ) -> None:
-        get_gbif_settings.cache_clear()
         monkeypatch.setenv("GBIF_USERNAME", "user")
         monkeypatch.setenv("GBIF_PASSWORD", "pass")
         monkeypatch.setenv("GBIF_EMAIL", "u@example.com")
@@ -0,0 +1,154 @@
+"""Tests for the queries module."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from dwca_tools import queries
+from dwca_tools.aggregate import create_taxa_table
+from dwca_tools.db import create_engine_and_session
+
+POSTGRES_URL = os.environ.get("DWCA_TEST_POSTGRES_URL")
+
+
+@pytest.fixture
+def session(tmp_path: Path) -> Iterator[Session]:
+    """Return a session on a small SQLite database with occurrence rows."""
+    engine, session = create_engine_and_session(f"sqlite:///{tmp_path / 'q.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            sa.text(
+                'CREATE TABLE occurrence ("gbifID" TEXT, "taxonID" TEXT,'
+                ' "scientificName" TEXT, family TEXT)'
+            )
+        )
+        conn.execute(
+            sa.text("INSERT INTO occurrence VALUES (:g, :t, :n, :f)"),
+            [{"g": str(i), "t": str(i % 4), "n": f"S{i % 4}", "f": f"F{i % 2}"} for i in range(30)],
+        )
+    yield session
+    session.close()
+
+
+class TestReflectTable:
+    """Tests for cached table reflection."""
+
+    def test_reflection_reused(self, session: Session) -> None:
+        """The same Table object is returned for repeated lookups on one engine."""
+        first = queries.reflect_table("occurrence", session)
+        assert queries.reflect_table("occurrence", session) is first
+        assert set(first.c.keys()) == {"gbifID", "taxonID", "scientificName", "family"}
+
+    def test_missing_table_not_cached(self, session: Session) -> None:
+        """A missing table raises and can be reflected once it exists."""
+        with pytest.raises(sa.exc.NoSuchTableError):
+            queries.reflect_table("taxa", session)
+        session.execute(sa.text('CREATE TABLE taxa ("taxonID" TEXT)'))
+        session.commit()
+        assert "taxonID" in queries.reflect_table("taxa", session).c
+
+
+class TestRandomSamples:
+    """Tests for random row sampling."""
+
+    def test_samples_every_table(self, session: Session) -> None:
+        """Each table gets a sample of at most the default limit."""
+        session.execute(sa.text('CREATE TABLE multimedia ("gbifID" TEXT)'))
+        session.commit()
+        samples = queries.random_sample_from_all_tables(session)
+        assert set(samples) == {"occurrence", "multimedia"}
+        assert len(samples["occurrence"]) == 5
+        assert samples["multimedia"] == []
+
+    def test_sqlite_sample_rows_distinct(self, session: Session) -> None:
+        """The rowid-based SQLite sample returns whole, distinct rows."""
+        result = queries.random_sample_from_table(session, "occurrence", limit=7)
+        assert len({row.gbifID for row in result}) == 7
+        assert result[0]._fields == ("gbifID", "taxonID", "scientificName", "family")
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(POSTGRES_URL is None, reason="DWCA_TEST_POSTGRES_URL not set")
+class TestRandomSamplesPostgres:
+    """Tests for TABLESAMPLE-based sampling (needs a scratch database)."""
+
+    @pytest.fixture
+    def pg_session(self) -> Iterator[Session]:
+        engine, session = create_engine_and_session(str(POSTGRES_URL))
+        with engine.begin() as conn:
+            conn.execute(sa.text("DROP TABLE IF EXISTS sample_rows"))
+            conn.execute(sa.text("CREATE TABLE sample_rows (id int, pad text)"))
+            conn.execute(
+                sa.text(
+                    "INSERT INTO sample_rows"
+                    " SELECT g, repeat('x', 200) FROM generate_series(1, :n) AS g"
+                ),
+                {"n": 20_000},
+            )
+        yield session
+        session.close()
+        with engine.begin() as conn:
+            conn.execute(sa.text("DROP TABLE sample_rows"))
+        engine.dispose()
+
+    @pytest.mark.parametrize("limit", [1, 5, 50_000])
+    def test_sample_size(self, pg_session: Session, limit: int) -> None:
+        """Large tables are page-sampled; oversized limits fall back to the full table."""
+        result = queries.random_sample_from_table(pg_session, "sample_rows", limit=limit)
+        assert len({row.id for row in result}) == min(limit, 20_000)
+
+
+class TestTaxaCounts:
+    """Tests for answering taxon queries from the taxa aggregate."""
+
+    QUERIES = (
+        queries.count_occurrences_per_taxon,
+        queries.count_multimedia_per_taxon,
+        queries.highest_occurrences,
+        queries.highest_multimedia,
+        queries.family_summary,
+    )
+
+    def test_same_results_as_aggregating(self, session: Session) -> None:
+        """Queries give the same answers before and after the taxa table exists."""
+        session.execute(sa.text('CREATE TABLE multimedia ("gbifID" TEXT)'))
+        session.execute(
+            sa.text("INSERT INTO multimedia VALUES (:g)"), [{"g": str(i)} for i in range(0, 30, 3)]
+        )
+        session.commit()
+        before = [sorted(map(tuple, query(session))) for query in self.QUERIES]
+
+        create_taxa_table(session.get_bind(), session)
+        after = [sorted(map(tuple, query(session, use_taxa_table=True))) for query in self.QUERIES]
+
+        assert after == before
+        inspector = sa.inspect(session.get_bind())
+        indexed = {c for ix in inspector.get_indexes("taxa") for c in ix["column_names"]}
+        assert {"occurrences_count", "multimedia_count"} <= indexed
+
+    def test_taxa_table_is_opt_in(self, session: Session) -> None:
+        """A stale taxa snapshot is only consulted when asked for."""
+        session.execute(sa.text('CREATE TABLE multimedia ("gbifID" TEXT)'))
+        create_taxa_table(session.get_bind(), session)
+        session.execute(sa.text("DELETE FROM occurrence"))
+        session.commit()
+
+        assert queries.highest_occurrences(session) == []
+        assert queries.highest_occurrences(session, use_taxa_table=True) != []
+
+
+class TestStreaming:
+    """Tests for streamed query results."""
+
+    def test_unbounded_queries_stream(self, session: Session) -> None:
+        """Per-taxon and per-family queries return a lazy Result, not a list."""
+        result = queries.count_occurrences_per_taxon(session)
+        assert isinstance(result, sa.Result)
+        assert sum(row.occurrence_count for row in result) == 30
+        assert {row.family for row in queries.family_summary(session)} == {"F0", "F1"}
@@ -2,17 +2,33 @@
 
 from __future__ import annotations
 
+import csv
+import io
+import json
+import re
 import zipfile
 from pathlib import Path
 
+import pytest
 from typer.testing import CliRunner
 
 from dwca_tools.cli import app
+from dwca_tools.summarize import parse_meta_tables
+from dwca_tools.taxa import _build_taxa_results, _line_blocks, _TaxaGroup
 
 runner = CliRunner()
 
 FIXTURE_PATH = Path(__file__).parent / "fixtures" / "test_dwca.zip"
 
+FIXTURE_SPECIES = (
+    "Danaus plexippus",
+    "Vanessa cardui",
+    "Papilio machaon",
+    "Pieris rapae",
+    "Papilio polyxenes",
+)
+SPECIES_RE = re.compile("|".join(map(re.escape, FIXTURE_SPECIES)))
+
 
 class TestFilesCommand:
     """Tests for the renamed 'files' command."""
@@ -24,6 +40,48 @@ class TestFilesCommand:
         assert "occurrence" in result.stdout
         assert "multimedia" in result.stdout
 
+    def test_files_directory_sample(self, tmp_path: Path) -> None:
+        """Large directories list a few files and a count of the rest."""
+        archive_path = tmp_path / "dirs.zip"
+        with zipfile.ZipFile(archive_path, "w") as zf:
+            zf.writestr("meta.xml", '<archive xmlns="http://rs.tdwg.org/dwc/text/"/>')
+            for i in range(12):
+                zf.writestr(f"dataset/{i:02d}.xml", "x")
+        result = runner.invoke(app, ["summarize", "files", str(archive_path)])
+        assert result.exit_code == 0, result.output
+        assert "dataset/04.xml" in result.stdout
+        assert "dataset/05.xml" not in result.stdout
+        assert "12 files (sample shown" in result.stdout
+        assert "Total files: 13" in result.stdout
+
+
+class TestParseMetaTables:
+    """Tests for single-pass meta.xml parsing."""
+
+    def test_core_listed_first(self) -> None:
+        """Tables carry their files, fields and quoting; the core comes first."""
+        meta_xml = b"""\
+<archive xmlns="http://rs.tdwg.org/dwc/text/">
+  <extension fieldsEnclosedBy="" rowType="http://rs.gbif.org/terms/1.0/Multimedia">
+    <files><location>multimedia.txt</location></files>
+    <field index="0" term="http://rs.gbif.org/terms/1.0/gbifID"/>
+  </extension>
+  <core rowType="http://rs.tdwg.org/dwc/terms/Occurrence">
+    <files><location>occurrence.txt</location></files>
+    <field index="0" term="http://rs.gbif.org/terms/1.0/gbifID"/>
+    <field index="1" term="http://rs.tdwg.org/dwc/terms/scientificName"/>
+    <field default="x" term="http://rs.tdwg.org/dwc/terms/basisOfRecord"/>
+  </core>
+</archive>
+"""
+        tables = parse_meta_tables(io.BytesIO(meta_xml))
+        assert [(t.name, t.filename, t.fields_enclosed_by) for t in tables] == [
+            ("occurrence", "occurrence.txt", '"'),
+            ("multimedia", "multimedia.txt", ""),
+        ]
+        assert tables[0].column_names == ["gbifID", "scientificName", "basisOfRecord"]
+        assert tables[0].columns[2].index is None
+
 
 class TestTaxaCommand:
     """Tests for the 'taxa' command."""
@@ -32,11 +90,8 @@ class TestTaxaCommand:
         """Default grouping by scientificName shows species with counts but no Images column."""
         result = runner.invoke(app, ["summarize", "taxa", str(FIXTURE_PATH)])
         assert result.exit_code == 0
-        assert "Danaus plexippus" in result.stdout
-        assert "Vanessa cardui" in result.stdout
-        assert "Papilio machaon" in result.stdout
-        assert "Pieris rapae" in result.stdout
-        assert "Papilio polyxenes" in result.stdout
+        missing = [sp for sp in FIXTURE_SPECIES if sp not in result.stdout]
+        assert not missing, f"missing: {missing}"
         # Check totals row
         assert "Total" in result.stdout
         # Images column should NOT be present without --image-counts
@@ -73,7 +128,7 @@ class TestTaxaCommand:
         assert "accepted names" in result.stdout
         assert "Images" not in result.stdout
         # "Swallowtail" has 4 occurrences, 2 taxonIDs, 2 accepted names
-        lines = result.stdout.split("\n")
+        lines = result.stdout.splitlines()
         swallowtail_lines = [line for line in lines if "Swallowtail" in line]
         assert len(swallowtail_lines) == 1
         swallowtail_line = swallowtail_lines[0]
@@ -88,22 +143,19 @@ class TestTaxaCommand:
         )
         assert result.exit_code == 0
         assert "Images" not in result.stdout
-        lines = result.stdout.split("\n")
-        species_count = sum(
-            1
-            for line in lines
-            if any(
-                sp in line
-                for sp in [
-                    "Danaus plexippus",
-                    "Vanessa cardui",
-                    "Papilio machaon",
-                    "Pieris rapae",
-                    "Papilio polyxenes",
-                ]
-            )
-        )
-        assert species_count == 2
+        assert len(SPECIES_RE.findall(result.stdout)) == 2
+
+    def test_taxa_table_row_limit(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Without --limit, the table shows at most TABLE_ROW_LIMIT groups; csv shows all."""
+        monkeypatch.setattr("dwca_tools.taxa.TABLE_ROW_LIMIT", 2)
+        result = runner.invoke(app, ["summarize", "taxa", str(FIXTURE_PATH)])
+        assert result.exit_code == 0
+        assert "Showing the top 2 groups" in result.stdout
+        assert "2 shown, 5 total" in result.stdout
+
+        result = runner.invoke(app, ["summarize", "taxa", str(FIXTURE_PATH), "--format", "csv"])
+        assert result.exit_code == 0
+        assert len(result.stdout.strip().splitlines()) == 6
 
     def test_taxa_image_counts_flag(self) -> None:
         """--image-counts shows the Images column with correct values."""
@@ -116,6 +168,20 @@ class TestTaxaCommand:
         # Fixture has multimedia data, so at least some image counts should be non-zero
         assert "Danaus plexippus" in result.stdout
 
+    def test_taxa_image_counts_values(self) -> None:
+        """Image counts per group are summed from multimedia rows by gbifID."""
+        result = runner.invoke(
+            app,
+            ["summarize", "taxa", str(FIXTURE_PATH), "--image-counts", "--format", "csv"],
+        )
+        assert result.exit_code == 0
+        lines = result.stdout.splitlines()
+        rows = list(csv.DictReader(lines[lines.index("name,rank,occurrences,images") :]))
+        images = {row["name"]: int(row["images"]) for row in rows}
+        assert images["Danaus plexippus"] == 3
+        assert images["Papilio polyxenes"] == 0
+        assert sum(images.values()) == 10
+
     def test_taxa_image_counts_warning(self) -> None:
         """--image-counts prints a memory usage warning."""
         result = runner.invoke(
@@ -123,9 +189,17 @@ class TestTaxaCommand:
             ["summarize", "taxa", str(FIXTURE_PATH), "--image-counts"],
         )
         assert result.exit_code == 0
-        assert "Image counting requires loading all occurrence IDs into memory" in result.stdout
+        assert "Image counting keeps a count per multimedia gbifID in memory" in result.stdout
         assert "dwca-tools convert" in result.stdout
 
+    def test_taxa_json_output(self) -> None:
+        """--format json writes a parseable list of groups to stdout."""
+        result = runner.invoke(app, ["summarize", "taxa", str(FIXTURE_PATH), "--format", "json"])
+        assert result.exit_code == 0
+        rows = json.loads(result.stdout)
+        assert len(rows) == 5
+        assert rows[0] == {"name": "Danaus plexippus", "rank": "", "occurrences": 5}
+
     def test_taxa_missing_column(self, tmp_path: Path) -> None:
         """Archive without the group-by column shows an error."""
         # Create a minimal archive without verbatimScientificName
@@ -153,3 +227,105 @@ class TestTaxaCommand:
         )
         assert result.exit_code != 0
         assert "not found" in result.stdout
+
+    def test_taxa_quoted_and_short_rows(self, tmp_path: Path) -> None:
+        """Quoted fields follow meta.xml and short rows count toward the empty group."""
+        meta_xml = """\
+<?xml version="1.0" encoding="utf-8"?>
+<archive xmlns="http://rs.tdwg.org/dwc/text/" metadata="eml.xml">
+  <core encoding="UTF-8" fieldsTerminatedBy="\t" linesTerminatedBy="\\n"
+        fieldsEnclosedBy="&quot;" ignoreHeaderLines="1"
+        rowType="http://rs.tdwg.org/dwc/terms/Occurrence">
+    <files><location>occurrence.txt</location></files>
+    <field index="0" term="http://rs.gbif.org/terms/1.0/gbifID"/>
+    <field index="1" term="http://rs.tdwg.org/dwc/terms/scientificName"/>
+    <field index="2" term="http://rs.tdwg.org/dwc/terms/taxonRank"/>
+  </core>
+</archive>
+"""
+        occurrence_txt = (
+            "gbifID\tscientificName\ttaxonRank\n"
+            '1\t"Danaus\tplexippus"\tSPECIES\n'
+            '2\t"Danaus\tplexippus"\tSPECIES\n'
+            "3\n"
+        )
+        archive_path = tmp_path / "quoted.zip"
+        with zipfile.ZipFile(archive_path, "w") as zf:
+            zf.writestr("meta.xml", meta_xml)
+            zf.writestr("occurrence.txt", occurrence_txt)
+
+        result = runner.invoke(app, ["summarize", "taxa", str(archive_path), "--format", "json"])
+        assert result.exit_code == 0, result.output
+        assert json.loads(result.stdout) == [
+            {"name": "Danaus\tplexippus", "rank": "SPECIES", "occurrences": 2},
+            {"name": "", "rank": "", "occurrences": 1},
+        ]
+
+    def test_taxa_crlf_lines(self, tmp_path: Path) -> None:
+        """CRLF line endings and a missing final newline do not leak into the groups."""
+        meta_xml = """\
+<?xml version="1.0" encoding="utf-8"?>
+<archive xmlns="http://rs.tdwg.org/dwc/text/" metadata="eml.xml">
+  <core encoding="UTF-8" fieldsTerminatedBy="\t" linesTerminatedBy="\\r\\n"
+        fieldsEnclosedBy="" ignoreHeaderLines="1"
+        rowType="http://rs.tdwg.org/dwc/terms/Occurrence">
+    <files><location>occurrence.txt</location></files>
+    <field index="0" term="http://rs.gbif.org/terms/1.0/gbifID"/>
+    <field index="1" term="http://rs.tdwg.org/dwc/terms/scientificName"/>
+  </core>
+</archive>
+"""
+        occurrence_txt = "gbifID\tscientificName\r\n1\tDanaus plexippus\r\n2\tDanaus plexippus"
+        archive_path = tmp_path / "crlf.zip"
+        with zipfile.ZipFile(archive_path, "w") as zf:
+            zf.writestr("meta.xml", meta_xml)
+            zf.writestr("occurrence.txt", occurrence_txt)
+
+        result = runner.invoke(app, ["summarize", "taxa", str(archive_path), "--format", "json"])
+        assert result.exit_code == 0, result.output
+        assert json.loads(result.stdout) == [
+            {"name": "Danaus plexippus", "rank": "", "occurrences": 2}
+        ]
+
+    @pytest.mark.parametrize(
+        "flags",
+        [[], ["--show-mismatched-names"], ["--show-mismatched-names", "--image-counts"]],
+    )
+    def test_taxa_jobs_match_serial(
+        self, flags: list[str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """--jobs aggregates in worker processes with the same results as one process."""
+        # Small blocks so the rows are spread over several tasks and merged.
+        monkeypatch.setattr("dwca_tools.taxa.PARALLEL_CHUNK_BYTES", 256)
+        args = ["summarize", "taxa", str(FIXTURE_PATH), "--format", "json", *flags]
+        serial = runner.invoke(app, args)
+        parallel = runner.invoke(app, [*args, "--jobs", "2"])
+        assert serial.exit_code == 0, serial.output
+        assert parallel.exit_code == 0, parallel.output
+        assert json.loads(parallel.stdout[parallel.stdout.index("[") :]) == json.loads(
+            serial.stdout[serial.stdout.index("[") :]
+        )
+
+
+class TestBuildTaxaResults:
+    """Tests for ranking aggregated taxa groups."""
+
+    def test_top_k_matches_full_sort(self) -> None:
+        """A small limit selects the same leading groups as a full sort."""
+        groups = {f"taxon {i:02d}": _TaxaGroup(count=i % 7) for i in range(40)}
+        full = _build_taxa_results(groups)
+        assert [r.occurrence_count for r in full[:3]] == [6, 6, 6]
+        assert _build_taxa_results(groups, limit=5) == full[:5]
+        assert _build_taxa_results(groups, limit=30) == full[:30]
+
+
+class TestLineBlocks:
+    """Tests for cutting a byte stream into blocks of whole lines."""
+
+    def test_blocks_end_at_line_breaks(self) -> None:
+        """Blocks end at newlines, keep every byte, and carry a long line over."""
+        data = b"a\tb\n" + b"x" * 20 + b"\nc\td\ne"
+        blocks = list(_line_blocks(io.BytesIO(data), 8))
+        assert b"".join(blocks) == data
+        assert all(block.endswith(b"\n") for block in blocks[:-1])
+        assert blocks[-1] == b"e"